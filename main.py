@@ -1,14 +1,47 @@
+import argparse
+import contextlib
+import csv
+import functools
+import hashlib
+import heapq
+import json
 import os
 import pickle
+import queue
+from collections import OrderedDict
+import numpy as np
 import pygame as pg
 import random
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
 import time
 
+START_TIME = time.perf_counter()
+STARTUP_TIMES = {} # phase: seconds spent on that part of starting up, for --startup-report
+
+
+@contextlib.contextmanager
+def startup_phase(phase):
+    start = time.perf_counter()
+    yield
+    STARTUP_TIMES[phase] = STARTUP_TIMES.get(phase, 0) + time.perf_counter() - start
+
+
 ENTER_CHARACTERS = [pg.K_RETURN, pg.K_KP_ENTER]
 
+# Runs without a window or any sound, for simulating games faster than real time
+HEADLESS = '--headless' in sys.argv or '--benchmark' in sys.argv or os.environ.get('WORD_CRUSHER_HEADLESS') == '1'
+
+# Makes the pause and menu music by filtering the normal track, instead of playing all three versions at once
+DSP_MUSIC = '--dsp-music' in sys.argv or os.environ.get('WORD_CRUSHER_DSP_MUSIC') == '1'
+
 WORD_PATH = 'data/words.txt'
 PAGES_PATH = 'data/pages'
 STATS_PATH = 'data/stats.DAT'
+PCM_CACHE_PATH = 'data/cache'
 WIDTH = 450
 HEIGHT = 600
 FOOTER_HEIGHT = 100
@@ -19,6 +52,17 @@ REVEAL_MULTIPLIER = 2
 WORD_SIZE = 50
 TEXT_FADE_TIME = 1000
 POWERUP_DURATION = 10000
+LEVEL_UP_TIME = 30000 # milliseconds between the game getting harder on its own
+IDLE_TIMEOUT = 500 # milliseconds that screens which don't animate will wait for input
+PAUSED_FPS = 10 # nothing moves while paused, so there's no need to draw at the full frame rate
+MENU_TARGET = 300 # milliseconds from starting to the menu being on the screen
+
+# The words move in fixed steps, so the game plays the same however fast it is drawn
+SIMULATION_STEP = 1000 / 60 # milliseconds
+MAX_SIMULATION_STEPS = 5 # most steps to catch up on in one frame before giving up on the lost time
+
+BENCHMARK_SIZES = [10, 100, 1000, 10000] # words on the screen
+BENCHMARK_THRESHOLD = 0.25 # how much slower than the baseline something can get before it's flagged
 
 MIN_POWERUP_FREQUENCY = 1000
 MAX_POWERUP_FREQUENCY = 30000
@@ -92,61 +136,562 @@ common_words = []
 difficult_words = []
 boss_words = []
 
-icon = pg.image.load('data/icon1.png')
-pg.display.set_icon(icon)
-pg.init()
+# pg.init() would open the mixer with its own settings, so it's opened first with the game's
+if not HEADLESS:
+    with startup_phase("mixer_init"):
+        pg.mixer.pre_init(44100, -16, 2, 2048)
+        pg.mixer.init()
+
+with startup_phase("pg_init"):
+    if HEADLESS:
+        pg.font.init()
+    else:
+        icon = pg.image.load('data/icon1.png')
+        pg.display.set_icon(icon)
+        pg.init()
+
+
+# FONTS
+class FontRegistry:
+    """Shares Font objects between everything that draws text, so each font is only looked up once."""
+
+    def __init__(self):
+        self.fonts = {} # (family, size, bold, italic): Font
+        self.paths = {} # (family, bold, italic): path of the font file
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"FontRegistry({len(self.fonts)} fonts, {self.hits} hits, {self.misses} misses)"
+
+    def get(self, family, size, bold=False, italic=False):
+        key = (family.lower(), size, bold, italic)
+
+        try:
+            font = self.fonts[key]
+            self.hits += 1
+            return font
+        except KeyError:
+            self.misses += 1
+
+        # Searching the system fonts is the slow part, so only do it once per family and style
+        path_key = (family.lower(), bold, italic)
+        if path_key not in self.paths:
+            self.paths[path_key] = pg.font.match_font(family, bold, italic)
+
+        path = self.paths[path_key]
+        font = pg.font.Font(path, size)
+
+        # Same as SysFont, fake the style if the font has no file for it
+        if path is None:
+            font.set_bold(bold)
+            font.set_italic(italic)
+
+        self.fonts[key] = font
+        return font
+
+    def report(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0
+        return {
+            "fonts": len(self.fonts),
+            "files": len(set(self.paths.values())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": hit_rate
+        }
+
+FONTS = FontRegistry()
+
+
+class TextCache:
+    """
+    Least recently used cache of rendered text, so the same string isn't rendered again every frame.
+    The surfaces are shared, so anything that calls set_alpha on one has to set it again before every blit.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.surfaces = OrderedDict() # (font, text, antialias, color): Surface
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"TextCache({len(self.surfaces)} surfaces, {self.bytes:,} bytes, {self.hit_rate:.0%} hit rate)"
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def render(self, font, text, antialias, color):
+        # Colours can have float parts while the background fades, rounding them keeps the keys from changing every frame
+        color = tuple(int(i) for i in color)
+        key = (font, text, antialias, color)
+
+        try:
+            surface = self.surfaces[key]
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        except KeyError:
+            self.misses += 1
+
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.bytes += self.surface_bytes(surface)
+
+        # Throw away the least recently used text until we are back under budget
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= self.surface_bytes(old)
+            self.evictions += 1
+
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def report(self):
+        return {
+            "surfaces": len(self.surfaces),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate
+        }
+
+TEXT_CACHE = TextCache()
+
+
+class GlyphAtlas:
+    """
+    Falling words only ever use a few characters, so each character is rendered once per font and words are put
+    together out of those with a single blits call. The words are made with a palette, so colouring one in is just
+    changing its palette.
+    """
+
+    CHARACTERS = 'abcdefghijklmnopqrstuvwxyz-*'
+    COLORKEY = (0, 255, 0) # never used by the words, so it is safe to use as the transparent colour
+    WHITE = (255, 255, 255)
+
+    def __init__(self, max_atlases=256):
+        self.atlases = OrderedDict() # font: {character: (Surface, advance)}
+        self.max_atlases = max_atlases
+        self.builds = 0
+        self.composes = 0
+
+    def __repr__(self):
+        return f"GlyphAtlas({len(self.atlases)} atlases, {self.builds} builds, {self.composes} words)"
+
+    def get_atlas(self, font):
+        try:
+            atlas = self.atlases[font]
+            self.atlases.move_to_end(font)
+            return atlas
+        except KeyError:
+            pass
+
+        # Rendered in white, which render swaps for the word's colour in its palette
+        atlas = {}
+        for character in self.CHARACTERS:
+            advance = font.metrics(character)[0][4]
+            atlas[character] = (font.render(character, False, self.WHITE), advance)
+
+        self.atlases[font] = atlas
+        self.builds += 1
+
+        if len(self.atlases) > self.max_atlases:
+            self.atlases.popitem(last=False)
+
+        return atlas
+
+    def render(self, font, text, color):
+        color = tuple(int(i) for i in color)
+
+        # Anything the atlas doesn't have falls back to rendering the whole string
+        if not all(character in self.CHARACTERS for character in text):
+            return TEXT_CACHE.render(font, text, False, color)
+
+        atlas = self.get_atlas(font)
+        blits = []
+        x = width = 0
+
+        for character in text:
+            glyph, advance = atlas[character]
+            blits.append((glyph, (x, 0)))
+            width = max(width, x + glyph.get_width())
+            x += advance
+
+        # Index 0 is the background and 1 the letters, the same as the glyphs
+        surface = pg.Surface((max(width, x), font.get_height()), 0, 8)
+        surface.set_palette([self.COLORKEY, self.WHITE])
+        surface.fill(0)
+        surface.blits(blits, False)
+        surface.set_palette_at(1, color)
+        surface.set_colorkey(self.COLORKEY)
+
+        self.composes += 1
+        return surface
+
+    def report(self):
+        return {
+            "atlases": len(self.atlases),
+            "builds": self.builds,
+            "words": self.composes
+        }
+
+GLYPHS = GlyphAtlas()
+
+
+class PCMCache:
+    """
+    Keeps every sound decoded on disk, as the raw samples the mixer plays, so later launches only have to read the
+    file back instead of decoding it again. Files are named after a hash of the source and the mixer's format, so
+    editing a sound or changing the format just misses, and the old file is deleted when the new one is saved.
+    """
+
+    def __init__(self, path=PCM_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0 # cache files which couldn't be read or written
+
+    def __repr__(self):
+        return f"PCMCache({self.hits} hits, {self.misses} misses, {self.errors} errors)"
+
+    def cache_path(self, source):
+        with open(source, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()[:16]
+
+        frequency, size, channels = pg.mixer.get_init()
+        name = os.path.basename(source).replace('.', '_')
+        return os.path.join(self.path, f"{name}-{digest}-{frequency}_{size}_{channels}.pcm")
+
+    def load(self, cached):
+        # Sound copies the samples in either way, so there's nothing to gain from mapping the file
+        with open(cached, 'rb') as file:
+            return pg.mixer.Sound(buffer=file.read())
+
+    def save(self, cached, sound):
+        name = os.path.basename(cached).split('-')[0]
+        os.makedirs(self.path, exist_ok=True)
+
+        # Written under another name first, so a half written file is never read
+        temporary = f"{cached}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as file:
+            file.write(sound.get_raw())
+        os.replace(temporary, cached)
+
+        # Anything else cached for the same file is out of date now
+        for file in os.listdir(self.path):
+            if file.split('-')[0] == name and file.endswith('.pcm') and file != os.path.basename(cached):
+                os.remove(os.path.join(self.path, file))
+
+    def sound(self, source):
+        cached = self.cache_path(source)
+
+        try:
+            sound = self.load(cached)
+        except (OSError, ValueError, pg.error):
+            sound = None
+
+        with self.lock:
+            if sound is not None:
+                self.hits += 1
+                return sound
+            self.misses += 1
+
+        sound = pg.mixer.Sound(source)
+
+        try:
+            self.save(cached, sound)
+        except OSError:
+            with self.lock:
+                self.errors += 1
+        return sound
+
+    def report(self):
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+PCM_CACHE = PCMCache()
+
+
+class Asset:
+    """A handle for something the asset loader loads. get() waits for it, or loads it there and then if nothing has yet."""
+
+    def __init__(self, name, loader, priority):
+        self.name = name
+        self.loader = loader
+        self.priority = priority
+        self.value = None
+        self.error = None
+        self.load_time = None
+        self.claimed = False
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def __repr__(self):
+        return f"Asset({self.name}, {'ready' if self.ready else 'waiting'})"
+
+    @property
+    def ready(self):
+        return self.done.is_set()
+
+    def claim(self):
+        """Makes sure only one thread loads the asset."""
+        with self.lock:
+            if self.claimed:
+                return False
+            self.claimed = True
+            return True
+
+    def load(self):
+        start = time.perf_counter()
+
+        try:
+            self.value = self.loader()
+        except Exception as error: # kept for get() to raise, so the loader thread carries on with everything else
+            self.error = error
+
+        self.load_time = time.perf_counter() - start
+        self.done.set()
+
+    def get(self):
+        if self.claim():
+            self.load()
+
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class AssetLoader:
+    """
+    Loads the sounds, music, words and pages on a background thread, most important first, so the menu can go up
+    straight away and show how far along it is. Anything which is needed sooner is loaded by whoever asks for it.
+    """
+
+    def __init__(self):
+        self.assets = {} # name: Asset
+        self.thread = None
+        self.menu_time = None # seconds from starting until the menu was first on the screen
+        self.finish_time = None # seconds from starting until everything was loaded
+
+    def __repr__(self):
+        return f"AssetLoader({self.loaded}/{len(self.assets)} loaded)"
+
+    def add(self, name, loader, priority=0):
+        asset = Asset(name, loader, priority)
+        self.assets[name] = asset
+        return asset
+
+    def get(self, name):
+        return self.assets[name].get()
+
+    def ready(self, name):
+        return self.assets[name].ready
+
+    @property
+    def loaded(self):
+        return sum(1 for asset in self.assets.values() if asset.ready)
+
+    @property
+    def progress(self):
+        return self.loaded / len(self.assets) if self.assets else 1
+
+    @property
+    def loading(self):
+        return self.loaded < len(self.assets)
+
+    def loader(self):
+        # sorted keeps the order things were added in for the same priority
+        for asset in sorted(self.assets.values(), key=lambda asset: -asset.priority):
+            if asset.claim():
+                asset.load()
+
+        self.finish_time = time.perf_counter() - START_TIME
+
+    def start(self):
+        self.thread = threading.Thread(target=self.loader, daemon=True)
+        self.thread.start()
+
+    def shown_menu(self):
+        if self.menu_time is None:
+            self.menu_time = time.perf_counter() - START_TIME
+
+    def report(self):
+        return {
+            "menu_time": self.menu_time,
+            "menu_target_met": self.menu_time is not None and self.menu_time * 1000 <= MENU_TARGET,
+            "finish_time": self.finish_time,
+            "assets": {
+                name: {"priority": asset.priority, "load_time": asset.load_time, "error": repr(asset.error) if asset.error else None}
+                for name, asset in self.assets.items()
+            }
+        }
+
+ASSETS = AssetLoader()
+
 
 # SFX
 class SFX:
-    SOUNDS = {
-        'hit': pg.mixer.Sound('sfx/hit.wav'),
-        'destroy': pg.mixer.Sound('sfx/destroy.wav'),
-        'reveal': pg.mixer.Sound('sfx/reveal.wav'),
-        'miss': pg.mixer.Sound('sfx/miss.wav'),
-        'gameover': pg.mixer.Sound('sfx/gameover.wav'),
-        'pause': pg.mixer.Sound('sfx/pause.wav'),
-        'resume': pg.mixer.Sound('sfx/resume.wav'),
+    """
+    Sound effects play on their own pool of channels after the music's. Once every voice is busy, a new sound cuts
+    off the oldest of the least important ones, or is dropped if they're all more important than it.
+    """
+
+    VOICES = 12
+    CHANNELS = []
+
+    # Higher goes first
+    PRIORITIES = {
+        'gameover': 3,
+        'powerup': 2,
+        'pause': 2,
+        'resume': 2,
+        'destroy': 1,
+        'reveal': 1,
+        'streak': 1,
+        'combo': 1,
+        'hit': 0,
+        'miss': 0
+    }
+
+    FILES = {
+        'hit': 'sfx/hit.wav',
+        'destroy': 'sfx/destroy.wav',
+        'reveal': 'sfx/reveal.wav',
+        'miss': 'sfx/miss.wav',
+        'gameover': 'sfx/gameover.wav',
+        'pause': 'sfx/pause.wav',
+        'resume': 'sfx/resume.wav',
     }
 
-    POWERUP_SOUNDS = {
-        'bomb': pg.mixer.Sound('sfx/bomb.wav'),
-        'clear': pg.mixer.Sound('sfx/clear.wav'),
-        'score': pg.mixer.Sound('sfx/score.wav'),
-        'freeze': pg.mixer.Sound('sfx/freeze.wav'),
-        'reveal': pg.mixer.Sound('sfx/reveal2.wav'),
-        'punch':pg.mixer.Sound('sfx/punch.wav')
+    POWERUP_FILES = {
+        'bomb': 'sfx/bomb.wav',
+        'clear': 'sfx/clear.wav',
+        'score': 'sfx/score.wav',
+        'freeze': 'sfx/freeze.wav',
+        'reveal': 'sfx/reveal2.wav',
+        'punch': 'sfx/punch.wav'
     }
 
+    SOUNDS = {}
+    POWERUP_SOUNDS = {}
     STREAK = []
     COMBO = []
 
-    for file in os.listdir('sfx'):
-        path = os.path.join('sfx', file)
-        
-        if file.startswith('streak'):
-            STREAK.append(pg.mixer.Sound(path))
+    MENU_SOUNDS = ['reveal', 'hit', 'destroy'] # loaded first, since the menu plays them
+
+    @staticmethod
+    def load_sound(sounds, key, path):
+        sounds[key] = PCM_CACHE.sound(path)
 
-        if file.startswith('combo'):
-            COMBO.append(pg.mixer.Sound(path))
+    @classmethod
+    def load(cls):
+        """
+        Hands every sound to the asset loader, this needs the mixer so it isn't done in headless mode. Sounds which
+        haven't loaded yet just don't play.
+        """
+
+        for name, path in cls.FILES.items():
+            ASSETS.add(path, functools.partial(cls.load_sound, cls.SOUNDS, name, path), 2 if name in cls.MENU_SOUNDS else 1)
+
+        for name, path in cls.POWERUP_FILES.items():
+            ASSETS.add(path, functools.partial(cls.load_sound, cls.POWERUP_SOUNDS, name, path), 0)
+
+        for file in os.listdir('sfx'):
+            path = os.path.join('sfx', file)
+            
+            if file.startswith('streak'):
+                sounds = cls.STREAK
+            elif file.startswith('combo'):
+                sounds = cls.COMBO
+            else:
+                continue
+
+            # Keep the place for the sound so they stay in the same order
+            sounds.append(None)
+            ASSETS.add(path, functools.partial(cls.load_sound, sounds, len(sounds) - 1, path), 0)
+
+    @classmethod
+    def reserve(cls):
+        """Sets aside the channels after the music's for sound effects, so neither can cut the other off."""
+
+        first = len(Music.CHANNELS)
+        pg.mixer.set_num_channels(first + cls.VOICES)
+        pg.mixer.set_reserved(first + cls.VOICES) # stops pygame picking any of them for a Sound.play
+        cls.CHANNELS = [pg.mixer.Channel(first + idx) for idx in range(cls.VOICES)]
 
     def __init__(self):
         self.muted = False
+        self.priorities = [0] * self.VOICES # what each voice was last playing
+        self.started = [0] * self.VOICES # when each voice was last played, counted in sounds
+        self.played = 0
+        self.steals = 0
+        self.drops = 0
+        self.unloaded = 0 # sounds which weren't loaded yet when they were played
+
+    def __repr__(self):
+        return f"SFX({self.played:,} played, {self.steals:,} stolen, {self.drops:,} dropped)"
+
+    def voice(self, sound, priority):
+        if sound is None:
+            self.unloaded += 1
+            return
+
+        for idx, channel in enumerate(self.CHANNELS):
+            if not channel.get_busy():
+                break
+        else:
+            idx = min(range(len(self.CHANNELS)), key=lambda idx: (self.priorities[idx], self.started[idx]))
+
+            if self.priorities[idx] > priority:
+                self.drops += 1
+                return
+            self.steals += 1
+
+        self.CHANNELS[idx].play(sound)
+        self.priorities[idx] = priority
+        self.started[idx] = self.played
+        self.played += 1
 
     def play(self, sound):
         if not self.muted:
-            pg.mixer.Sound.play(SFX.SOUNDS[sound])
+            self.voice(SFX.SOUNDS.get(sound), self.PRIORITIES[sound])
 
-    def play_powerup_sfx(self, sound):
+    def play_powerup_sfx(self, sound, priority='powerup'):
         if not self.muted:
-            pg.mixer.Sound.play(SFX.POWERUP_SOUNDS[sound])
+            self.voice(SFX.POWERUP_SOUNDS.get(sound), self.PRIORITIES[priority])
 
     def play_streak_sfx(self, streak_num):
         if not self.muted:
-            pg.mixer.Sound.play(SFX.STREAK[streak_num])
+            self.voice(SFX.STREAK[streak_num], self.PRIORITIES['streak'])
 
     def play_combo_sfx(self, combo_num):
         if not self.muted:
-            pg.mixer.Sound.play(SFX.COMBO[combo_num])
+            self.voice(SFX.COMBO[combo_num], self.PRIORITIES['combo'])
+
+    def report(self):
+        return {
+            "played": self.played,
+            "steals": self.steals,
+            "drops": self.drops,
+            "unloaded": self.unloaded,
+            "busy": sum(1 for channel in self.CHANNELS if channel.get_busy())
+        }
 
     def mute(self):
         self.muted = True
@@ -157,47 +702,133 @@ class SFX:
 
 # MUSIC
 # Play both songs at the same time, so that the song is filtered in the menu
-pg.mixer.pre_init(44100, -16, 2, 2048)
-pg.mixer.init()
-
 class Music:
-    CHANNELS = {
-        "normal": pg.mixer.Channel(0),
-        "filter": pg.mixer.Channel(1),
-        "menu": pg.mixer.Channel(2)
-    }
+    """
+    Only the song that's playing is kept decoded. The next one in the playlist is decoded on a background thread
+    while this one plays, so it's ready by the time it's switched to, and everything else is let go.
+    """
+
+    CHANNELS = {}
 
-    SONGS = {
+    FILES = {
         "Destiny": {
-            "normal": pg.mixer.Sound('music/destiny.ogg'),
-            "filter": pg.mixer.Sound('music/destiny_filter.ogg'),
-            "menu": pg.mixer.Sound('music/destiny_menu.ogg')},
+            "normal": 'music/destiny.ogg',
+            "filter": 'music/destiny_filter.ogg',
+            "menu": 'music/destiny_menu.ogg'},
         "Throwback": {
-            "normal": pg.mixer.Sound('music/throwback.ogg'),
-            "filter": pg.mixer.Sound('music/throwback_filter.ogg'),
-            "menu": pg.mixer.Sound('music/throwback_menu.ogg')},
+            "normal": 'music/throwback.ogg',
+            "filter": 'music/throwback_filter.ogg',
+            "menu": 'music/throwback_menu.ogg'},
         "Viper": {
-            "normal": pg.mixer.Sound('music/viper.ogg'),
-            "filter": pg.mixer.Sound('music/viper_filter.ogg'),
-            "menu": pg.mixer.Sound('music/viper_menu.ogg')},
+            "normal": 'music/viper.ogg',
+            "filter": 'music/viper_filter.ogg',
+            "menu": 'music/viper_menu.ogg'},
         "Waywards": {
-            "normal": pg.mixer.Sound('music/waywards.ogg'),
-            "filter": pg.mixer.Sound('music/waywards_filter.ogg'),
-            "menu": pg.mixer.Sound('music/waywards_menu.ogg')}
+            "normal": 'music/waywards.ogg',
+            "filter": 'music/waywards_filter.ogg',
+            "menu": 'music/waywards_menu.ogg'}
     }
 
-    TRACK_LIST = list(SONGS.keys())
+    TRACK_LIST = list(FILES.keys())
+
+    @classmethod
+    def load(cls):
+        cls.CHANNELS.update({
+            "normal": pg.mixer.Channel(0),
+            "filter": pg.mixer.Channel(1),
+            "menu": pg.mixer.Channel(2)
+        })
 
     def __init__(self):
         self.state = "menu"
         self.muted = False
-        self.song = random.choice(list(Music.SONGS.keys()))
+        self.song = random.choice(self.TRACK_LIST)
 
         pos = self.TRACK_LIST.index(self.song)
         self.playlist = self.TRACK_LIST[pos:] + self.TRACK_LIST[:pos]
-        
+
+        self.songs = {} # song: {state: Sound}, for the songs which are decoded
+        self.loading = {} # song: Event which is set once the background thread has decoded it
+        self.lock = threading.Lock()
+        self.decode_times = {} # song: seconds it took to decode
+        self.startup_time = None
+
+    def start(self):
+        """Decodes the first song and starts it playing, which the asset loader does so the menu isn't held up."""
+        start = time.perf_counter()
         self.init_song()
         self.play(self.state)
+        self.startup_time = time.perf_counter() - start
+
+    def __repr__(self):
+        return f"Music({self.song}, {len(self.songs)} songs decoded, {self.resident_bytes / 2**20:.1f}MB)"
+
+    @property
+    def resident_bytes(self):
+        frequency, size, channels = pg.mixer.get_init() or (0, 0, 0)
+
+        with self.lock:
+            sounds = [sound for song in self.songs.values() for sound in song.values()]
+        return round(sum(sound.get_length() for sound in sounds) * frequency * channels * abs(size) // 8)
+
+    def decode(self, song):
+        start = time.perf_counter()
+        sounds = {state: PCM_CACHE.sound(path) for state, path in self.FILES[song].items()}
+        self.decode_times[song] = time.perf_counter() - start
+        return sounds
+
+    def loader(self, song, done):
+        sounds = self.decode(song)
+
+        with self.lock:
+            self.songs[song] = sounds
+            del self.loading[song]
+        done.set()
+
+    def prefetch(self, song):
+        with self.lock:
+            if song in self.songs or song in self.loading:
+                return
+            done = self.loading[song] = threading.Event()
+
+        threading.Thread(target=self.loader, args=(song, done), daemon=True).start()
+
+    def wait(self):
+        """Blocks until every song being decoded in the background is done."""
+        with self.lock:
+            loading = list(self.loading.values())
+        for done in loading:
+            done.wait()
+
+    def get_song(self, song):
+        with self.lock:
+            done = self.loading.get(song)
+
+        # Already being decoded, so wait for that instead of doing it twice
+        if done is not None:
+            done.wait()
+
+        with self.lock:
+            sounds = self.songs.get(song)
+
+        if sounds is None:
+            sounds = self.decode(song)
+
+            with self.lock:
+                self.songs[song] = sounds
+        return sounds
+
+    def next_song(self):
+        pos = self.playlist.index(self.song)
+        return self.playlist[(pos+1) % len(self.playlist)]
+
+    def report(self):
+        return {
+            "startup_time": self.startup_time,
+            "resident_bytes": self.resident_bytes,
+            "decoded": list(self.songs),
+            "decode_times": dict(self.decode_times)
+        }
 
     # Play all songs at once so you can easily switch between them all
     def play(self, state):
@@ -209,14 +840,24 @@ class Music:
                 Music.CHANNELS[i].set_volume(0)
 
     def rotate_song(self):
-        pos = self.playlist.index(self.song)
-        self.song = self.playlist[(pos+1) % len(self.playlist)] 
+        self.song = self.next_song()
         self.init_song()
         self.play(self.state)
 
     def init_song(self):
+        sounds = self.get_song(self.song)
         for i in Music.CHANNELS:
-            Music.CHANNELS[i].play(Music.SONGS[self.song][i], -1)
+            Music.CHANNELS[i].play(sounds[i], -1)
+        self.keep_upcoming()
+
+    def keep_upcoming(self):
+        # Keep this song and the one after it, the channels still hold on to the last one until it's replaced
+        upcoming = self.next_song()
+        with self.lock:
+            for song in list(self.songs):
+                if song not in (self.song, upcoming):
+                    del self.songs[song]
+        self.prefetch(upcoming)
 
     def mute(self):
         self.muted = True
@@ -229,24 +870,290 @@ class Music:
             if i == self.state:
                 Music.CHANNELS[i].set_volume(1)
 
-MUSIC = Music()
-SOUND = SFX()
-            
-with open(WORD_PATH, 'r') as f:
-    for word in f:
-        word = word.rstrip().lower()
-
-        # Do not include words which contain punctuation
-        if word.isalpha():
-            if len(word) > 9:
-                boss_words.append(word)
-            elif len(word) > 6:
-                difficult_words.append(word)
-            elif len(word) > 2:
-                common_words.append(word)
-
-screen = pg.display.set_mode((WIDTH, HEIGHT))
-caption = pg.display.set_caption("Word Crusher")
+
+class FilteredMusic(Music):
+    """
+    Plays only the normal version of each song, on one channel, and makes the pause and menu versions from it with
+    biquad filters. A background thread filters the song a chunk at a time and queues it up on the channel, fading
+    between the filters whenever the state changes.
+    """
+
+    CHUNK = 4096 # samples queued at a time, about a tenth of a second
+    TAPS = 1024 # how much of each filter's impulse response is used, the rest is too quiet to hear
+    CROSSFADE = 300 # milliseconds
+
+    # Matched by ear and spectrum to the pre-made versions: pause is a steep low pass, menu sounds like a radio
+    FILTERS = {
+        "normal": [],
+        "filter": [("lowpass", 500), ("lowpass", 500)],
+        "menu": [("highpass", 250), ("lowpass", 3500)]
+    }
+
+    def __init__(self):
+        self.rate, _, self.channel_count = pg.mixer.get_init()
+        self.size = 1 << (self.CHUNK + self.TAPS - 2).bit_length() # FFT size which fits a chunk plus the filter's tail
+        self.responses = {state: self.frequency_response(sections) for state, sections in self.FILTERS.items()}
+        self.gains = {state: 0.0 for state in self.FILTERS} # so the music fades in when the game starts
+        self.tails = {state: None for state in self.FILTERS} # what each filter carries over into the next chunk
+        self.samples = None
+        self.position = 0
+        self.feeder = None
+        super().__init__()
+
+    def biquad(self, kind, frequency, q=0.7071):
+        """Coefficients for a low or high pass filter, from the Audio EQ Cookbook."""
+        w0 = 2 * np.pi * frequency / self.rate
+        alpha = np.sin(w0) / (2 * q)
+        cos = np.cos(w0)
+
+        if kind == "lowpass":
+            b = [(1 - cos) / 2, 1 - cos, (1 - cos) / 2]
+        else:
+            b = [(1 + cos) / 2, -(1 + cos), (1 + cos) / 2]
+        a = [1 + alpha, -2 * cos, 1 - alpha]
+        return [value / a[0] for value in b], [value / a[0] for value in a]
+
+    def frequency_response(self, sections):
+        """
+        Runs an impulse through the filters once, so every chunk can then be filtered all at once with an FFT rather
+        than sample by sample.
+        """
+
+        if not sections:
+            return None
+
+        response = np.zeros(self.TAPS)
+        response[0] = 1
+
+        for kind, frequency in sections:
+            (b0, b1, b2), (_, a1, a2) = self.biquad(kind, frequency)
+            x = response.tolist()
+            y = [0.0] * self.TAPS
+            x1 = x2 = y1 = y2 = 0.0
+
+            for n in range(self.TAPS):
+                y[n] = b0 * x[n] + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+                x2, x1 = x1, x[n]
+                y2, y1 = y1, y[n]
+            response = np.array(y)
+
+        return np.fft.rfft(response, self.size)[:, None]
+
+    @property
+    def resident_bytes(self):
+        with self.lock:
+            return sum(song["normal"].nbytes for song in self.songs.values())
+
+    def decode(self, song):
+        start = time.perf_counter()
+        samples = pg.sndarray.samples(PCM_CACHE.sound(self.FILES[song]["normal"])) # keeps the Sound alive without copying it
+        self.decode_times[song] = time.perf_counter() - start
+        return {"normal": samples}
+
+    def init_song(self):
+        samples = self.get_song(self.song)["normal"]
+
+        with self.lock:
+            self.samples = samples
+            self.position = 0
+        self.keep_upcoming()
+
+        if self.feeder is None:
+            self.feeder = threading.Thread(target=self.feed, daemon=True)
+            self.feeder.start()
+
+    def filter(self, state, dry):
+        response = self.responses[state]
+        if response is None:
+            return dry
+
+        wet = np.fft.irfft(np.fft.rfft(dry, self.size, axis=0) * response, self.size, axis=0)
+        tail = self.tails[state]
+        if tail is not None:
+            wet[:self.TAPS - 1] += tail
+
+        self.tails[state] = wet[self.CHUNK:self.CHUNK + self.TAPS - 1].copy()
+        return wet[:self.CHUNK]
+
+    def next_chunk(self):
+        with self.lock:
+            samples, start = self.samples, self.position
+            self.position = (start + self.CHUNK) % len(samples)
+
+        # Loops back round to the start of the song
+        dry = samples[(start + np.arange(self.CHUNK)) % len(samples)].astype(np.float32)
+        step = self.CHUNK / self.rate * 1000 / self.CROSSFADE
+        chunk = np.zeros_like(dry)
+
+        for state in self.FILTERS:
+            before = self.gains[state]
+            after = min(1.0, before + step) if state == self.state else max(0.0, before - step)
+            self.gains[state] = after
+
+            # Filters which can't be heard are skipped, and start again from silence when they're faded back in
+            if before == after == 0:
+                self.tails[state] = None
+                continue
+
+            gain = np.linspace(before, after, self.CHUNK, dtype=np.float32)
+            if dry.ndim > 1:
+                gain = gain[:, None]
+            chunk += gain * self.filter(state, dry)
+
+        return np.clip(chunk, -32768, 32767).astype(samples.dtype)
+
+    def feed(self):
+        channel = Music.CHANNELS["normal"]
+
+        while True:
+            # Keep one chunk queued up behind the one playing
+            if channel.get_busy() and channel.get_queue() is not None:
+                time.sleep(self.CHUNK / self.rate / 4)
+                continue
+
+            sound = pg.sndarray.make_sound(self.next_chunk())
+            if channel.get_busy():
+                channel.queue(sound)
+            else:
+                channel.play(sound)
+
+    def play(self, state):
+        if not self.muted:
+            self.state = state
+
+    def mute(self):
+        self.muted = True
+        Music.CHANNELS["normal"].set_volume(0)
+
+    def unmute(self):
+        self.muted = False
+        Music.CHANNELS["normal"].set_volume(1)
+
+
+# HEADLESS
+# Stand ins for the window and the mixer, so a game can be simulated as fast as the computer can go
+class NullSFX(SFX):
+    def play(self, sound):
+        pass
+
+    def play_powerup_sfx(self, sound, priority='powerup'):
+        pass
+
+    def play_streak_sfx(self, streak_num):
+        pass
+
+    def play_combo_sfx(self, combo_num):
+        pass
+
+
+class NullMusic(Music):
+    def init_song(self):
+        pass
+
+    def play(self, state):
+        self.state = state
+
+    def mute(self):
+        self.muted = True
+
+    def unmute(self):
+        self.muted = False
+
+
+class NullSurface(pg.Surface):
+    """Throws away anything blitted onto it, but still says where it would have gone."""
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        width, height = source.get_size()
+        return pg.Rect(dest[0], dest[1], width, height).clip(self.get_rect())
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = [self.blit(source, dest) for source, dest, *_ in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        return self.get_rect()
+
+
+if HEADLESS:
+    MUSIC = NullMusic()
+    SOUND = NullSFX()
+else:
+    with startup_phase("mixer_init"):
+        Music.load()
+        SFX.reserve()
+
+    MUSIC = FilteredMusic() if DSP_MUSIC else Music()
+    SOUND = SFX()
+
+    ASSETS.add("music", MUSIC.start, 3)
+    SFX.load()
+
+
+def load_words():
+    with open(WORD_PATH, 'r') as f:
+        for word in f:
+            word = word.rstrip().lower()
+
+            # Do not include words which contain punctuation
+            if word.isalpha():
+                if len(word) > 9:
+                    boss_words.append(word)
+                elif len(word) > 6:
+                    difficult_words.append(word)
+                elif len(word) > 2:
+                    common_words.append(word)
+
+ASSETS.add("words", load_words, 2)
+
+if HEADLESS:
+    screen = NullSurface((WIDTH, HEIGHT))
+else:
+    with startup_phase("set_mode"):
+        screen = pg.display.set_mode((WIDTH, HEIGHT))
+        caption = pg.display.set_caption("Word Crusher")
+
+
+def wait_for_events(timeout=None):
+    """
+    Sleeps until there is some input (or the timeout runs out) instead of spinning, for screens that only change
+    when the player does something. Mouse movement is dropped since nothing on those screens reacts to it.
+    """
+
+    if timeout is None:
+        timeout = IDLE_TIMEOUT
+
+    events = [pg.event.wait(timeout)] + pg.event.get()
+    return [event for event in events if event.type not in [pg.NOEVENT, pg.MOUSEMOTION]]
+
+
+class CpuMeter:
+    """Measures how much of a CPU a screen has used since it was opened."""
+
+    def __init__(self):
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+
+    def __repr__(self):
+        return f"CpuMeter({self.usage:.1%})"
+
+    @property
+    def usage(self):
+        wall = time.perf_counter() - self.wall_start
+        return (time.process_time() - self.cpu_start) / wall if wall else 0
+
+
+IDLE_CPU = {} # screen: how much of a CPU it used the last time it was open
+
+
+def save_idle_cpu(path):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["screen", "cpu_percent"])
+
+        for name, usage in IDLE_CPU.items():
+            writer.writerow([name, f"{100 * usage:.2f}"])
+
 
 #common_words = ['ATTENTION', 'TO', 'ALL', 'MEMBERS', 'OF', 'DERULO', 'DEDICATIONS', 'PLEASE', 'CHANGE', 'YOUR', 'STATUS', 'TO', 'FAN', 'OF', 'Louis', 'Kwan']
 #common_words = ["nail", "bail", "rail", "fail", "tail", "pail", "gail", "hail", "jail", "mail", "sail", "wail"]
@@ -256,19 +1163,155 @@ caption = pg.display.set_caption("Word Crusher")
 #common_words = ["bomb", "freeze", "bet"]
 
 
+class WordStore:
+    """
+    Keeps the position and speed of every falling word in NumPy arrays, so moving, knocking back and checking them
+    is done for all of the words at once. Words just look up their own slot.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.words = [None] * capacity # slot: Word
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.previous_y = np.zeros(capacity) # where the words were before the last step, for drawing between steps
+        self.seed = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity) # multiplied by the game's speed multiplier to get how far a word moves each frame
+        self.height = np.zeros(capacity)
+        self.interpolation = 1 # how far through the next step the words should be drawn
+
+        # No word is lower than this, so most frames can tell the game isn't over without looking at every word
+        self.lowest = -np.inf
+        self.fastest = 0
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"WordStore({self.count} words, capacity {len(self.words)})"
+
+    def grow(self):
+        capacity = len(self.words) * 2
+        self.words.extend([None] * (capacity - len(self.words)))
+
+        for column in ["x", "y", "previous_y", "seed", "speed", "height"]:
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, column, new)
+
+    def add(self, word, x, y, seed, height):
+        if self.count == len(self.words):
+            self.grow()
+
+        slot = self.count
+        self.words[slot] = word
+        self.x[slot] = x
+        self.y[slot] = y
+        self.previous_y[slot] = y
+        self.seed[slot] = seed
+        self.speed[slot] = (100 - seed) / 100
+        self.height[slot] = height
+        self.lowest = max(self.lowest, y)
+        self.fastest = max(self.fastest, self.speed[slot])
+
+        self.count += 1
+        return slot
+
+    def remove(self, word):
+        """Moves the last word into the removed word's slot, so the arrays never have gaps."""
+
+        slot = word.slot
+        last = self.count - 1
+
+        if slot != last:
+            moved = self.words[last]
+            self.words[slot] = moved
+            moved.slot = slot
+
+            for column in [self.x, self.y, self.previous_y, self.seed, self.speed, self.height]:
+                column[slot] = column[last]
+
+        self.words[last] = None
+        self.count -= 1
+        word.slot = None
+
+    def clear(self):
+        for word in self.words[:self.count]:
+            word.slot = None
+            
+        self.words[:self.count] = [None] * self.count
+        self.count = 0
+        self.lowest = -np.inf
+
+    def move(self, speed_multiplier):
+        n = self.count
+        self.previous_y[:n] = self.y[:n]
+        self.y[:n] += speed_multiplier * self.speed[:n]
+        self.lowest += speed_multiplier * self.fastest
+
+    def shift(self, slot, distance):
+        """Jumps a word by some distance straight away, rather than it sliding there between steps."""
+        self.y[slot] += distance
+        self.previous_y[slot] += distance
+
+        if distance > 0:
+            self.lowest = max(self.lowest, self.y[slot])
+
+    def knockback(self, amount):
+        """Knocks every word upwards, with slower words being knocked back less."""
+        n = self.count
+        knockback = amount * self.speed[:n]
+        self.y[:n] -= knockback
+        self.previous_y[:n] -= knockback
+
+    def draw_y(self, slot):
+        previous = self.previous_y[slot]
+        return float(previous + (self.y[slot] - previous) * self.interpolation)
+
+    def above_screen(self):
+        n = self.count
+        slots = np.flatnonzero(self.y[:n] < -self.height[:n])
+        return [self.words[slot] for slot in slots]
+
+    def any_below(self, y):
+        if self.lowest <= y:
+            return False
+
+        # Only look at every word once they might have got that far, which also tightens the bound again
+        self.lowest = self.y[:self.count].max() if self.count else -np.inf
+        return bool(self.lowest > y)
+
+
 class Word:
+    """
+    How far through a word the player is and how it's being shown, the string on the screen is only put together
+    when the word needs rendering again. Slots keep the many words on the screen small.
+    """
+
+    __slots__ = ["font", "original_value", "width", "mode", "game", "index_target", "store", "slot", "surface", "surface_key"]
+
+    # How the word is shown
+    HIDDEN = 0 # letters typed so far, dashes for the rest
+    REVEALED = 1 # stars for the letters typed so far, then the rest of the word
+    SHOWN = 2 # the whole word
     
     def __init__(self, value, game):
-        self.font = pg.font.SysFont('Times New Roman', game.word_size)
+        self.font = FONTS.get('Times New Roman', game.word_size)
         self.original_value = value.lower()
-        self.width, self.height = self.font.size(self.original_value) # dimensions of the rendered word
-        self.state = '-' * len(value)
+        self.width, height = self.font.size(self.original_value) # dimensions of the rendered word
+        self.mode = Word.HIDDEN
         self.game = game
         
-        self.x = random.randint(0, int(WIDTH-self.width)) # this ensures that words don't appear off the screen
-        self.y = -self.height
+        x = game.rng.randint(0, int(WIDTH-self.width)) # this ensures that words don't appear off the screen
         self.index_target = 0
-        self.seed = random.randint(0, 50)
+        seed = game.rng.randint(0, 50)
+
+        # The position, speed and size live in the game's word store
+        self.store = game.store
+        self.slot = self.store.add(self, x, -height, seed, height)
+        self.surface = None
+        self.surface_key = None
 
         # if enter is held, ensure that words spawn visible
         if game.visible_words:
@@ -278,64 +1321,86 @@ class Word:
         return f"Word({self.original_value})"
 
     def draw(self):
-        text = self.font.render(self.state, False, self.color)
-        screen.blit(text, (self.x, self.y))
+        # Only put the word back together once it has been hit, shown differently or changed colour
+        # GlyphAtlas rounds the colour down anyway, so the red fade only needs a rebuild when it drops a whole shade
+        key = (self.index_target, self.mode, int(self.game.redness))
+        if key != self.surface_key:
+            self.surface = GLYPHS.render(self.font, self.state, self.color)
+            self.surface_key = key
+        self.game.dirty.add(screen.blit(self.surface, (self.x, self.store.draw_y(self.slot))))
+
+    @property
+    def state(self):
+        idx = self.index_target
+
+        if self.mode == Word.HIDDEN:
+            return self.original_value[:idx] + '-' * (len(self.original_value) - idx)
+        if self.mode == Word.REVEALED:
+            return '*' * idx + self.original_value[idx:]
+        return self.original_value
+
+    @property
+    def x(self):
+        return self.store.x[self.slot]
+
+    @x.setter
+    def x(self, value):
+        self.store.x[self.slot] = value
+
+    @property
+    def y(self):
+        return self.store.y[self.slot]
+
+    @y.setter
+    def y(self, value):
+        self.store.shift(self.slot, value - self.y)
+
+    @property
+    def height(self):
+        return self.store.height[self.slot]
 
     # 0 will be the fastest and will be black
     # 50 will be the slowest and will be a shade of gray (200, 200, 200)
+    @property
+    def seed(self):
+        return int(self.store.seed[self.slot])
+
     @property
     def speed(self):
-        return self.game.current_speed_multiplier * ((100 - self.seed) / 100)
+        return self.game.current_speed_multiplier * self.store.speed[self.slot]
 
     @property
     def color(self):
-        if game.redness > 0:
-            return ((self.seed*4) + self.game.redness, self.seed*4, self.seed*4)
-        return (self.seed*4, self.seed*4, self.seed*4)
+        shade = self.seed * 4
+        if self.game.redness > 0:
+            return (shade + self.game.redness, shade, shade)
+        return (shade, shade, shade)
 
     @property
     def is_visible(self):
         return self.game.visible_words
 
-    def move(self):
-        self.y += self.speed
-
     def reveal(self):
-        self.state = self.original_value
+        self.mode = Word.SHOWN
 
     def hide(self):
-        self.state = '-' * len(self.state)
+        self.mode = Word.HIDDEN
+        self.game.untarget(self)
         self.index_target = 0
+        self.game.target(self)
 
+    # Partially means the letters already typed are kept
     def partially_hide(self):
-        word = ''
-        for idx, i in enumerate(self.state):
-            if i == '*':
-                word += self.original_value[idx]
-            else:
-                word += '-'
-        self.state = word
+        self.mode = Word.HIDDEN
 
     def partially_reveal(self):
-        word = ''
-        for idx, i in enumerate(self.state):
-            if i == '-':
-                word += self.original_value[idx]
-            else:
-                word += '*'
-        self.state = word
-            
-    @property
-    def is_onscreen(self):
-        return self.y <= HEIGHT - FOOTER_HEIGHT
-
-    @property
-    def is_above_screen(self):
-        return self.y < -self.height
+        self.mode = Word.REVEALED
 
     def damage(self, current_letter):
         if self.original_value[self.index_target] == current_letter:
+            self.game.untarget(self)
             self.index_target += 1
+            self.game.target(self)
             self.game.score += round(LETTER_POINTS * self.game.score_multiplier)
             self.game.hit_letter = True
 
@@ -343,22 +1408,17 @@ class Word:
                 STATS['general']["Letters Destroyed"] += 1
                 STATS['letter'][current_letter] += 1
 
-            if not self.is_visible:
-                word_completed = self.original_value[:self.index_target]
-                self.state = word_completed + '-' * (len(self.state) - len(word_completed))
-            else:
-                word_left = self.original_value[self.index_target:]
-                self.state = '*' * (len(self.original_value) - len(word_left)) + word_left
+            self.mode = Word.REVEALED if self.is_visible else Word.HIDDEN
             
             if not self.game.freeze_activated:
-                self.y -= self.game.punch * self.speed * 5 * self.game.punch_multiplier # Knock the word slightly upwards after each hit
+                knockback = self.game.punch * 5 * self.game.punch_multiplier
+                self.y -= knockback * self.speed # Knock the word slightly upwards after each hit
 
                 if self.game.sweep_activated:
-                    for word in self.game.words:
-                        word.y -= self.game.punch * word.speed * 5 * self.game.punch_multiplier
+                    self.store.knockback(knockback * self.game.current_speed_multiplier)
 
         if self.index_target == len(self.original_value):
-            self.game.words.remove(self)
+            self.game.remove_word(self)
             self.game.combo += 1
             self.game.score += round((WORD_POINTS - LETTER_POINTS) * self.game.score_multiplier)
             self.game.destroyed_word = True
@@ -376,6 +1436,8 @@ class Word:
         
 
 class Powerup(Word):
+    __slots__ = ["type"]
+
     def __init__(self, special_type, value, game):
         super().__init__(value, game)
         self.type = special_type
@@ -394,25 +1456,25 @@ class Powerup(Word):
         
         if self.type == "bomb":
             words = self.game.words.copy()
-            random.shuffle(words)
+            self.game.rng.shuffle(words)
             percentage = round(len(words) * 0.5)
             destroyed = words[:percentage]
             new_score = self.game.score
 
             for word in words:
                 if word in destroyed:
-                    self.game.words.remove(word)
+                    self.game.remove_word(word)
                     new_score += int(WORD_POINTS * self.game.score_multiplier * 5)
                     self.game.destroyed_word = True
             calculate_point_increase = True
                     
         if self.type == "clear":
-            self.game.words.clear()
+            self.game.clear_words()
             self.game.destroyed_word = True
         
         """
         if self.type == "gamble":
-            lucky = random.randint(0, 1)
+            lucky = self.game.rng.randint(0, 1)
             if lucky:
                 new_score = self.game.score * 2
             else:
@@ -451,7 +1513,7 @@ class PopUpText:
     """Text which fades away after a certain amount of time."""
     
     def __init__(self, value, x, y, game):
-        self.font = pg.font.SysFont('Times New Roman', 20)
+        self.font = FONTS.get('Times New Roman', 20)
         self.value = str(value)
         self.width, self.height = self.font.size(self.value)
         self.alpha = 255
@@ -463,10 +1525,10 @@ class PopUpText:
         if self.alpha <= 0:
             self.reset()
             
-        text = self.font.render(self.value, False, pg.Color('black'))
+        text = TEXT_CACHE.render(self.font, self.value, False, pg.Color('black'))
         text.set_alpha(self.alpha)
-        self.alpha -= 255 * 1000 / (self.game.fps * TEXT_FADE_TIME)
-        screen.blit(text, (self.x, self.y))
+        self.alpha -= 255 * self.game.frame_time / TEXT_FADE_TIME
+        self.game.dirty.add(screen.blit(text, (self.x, self.y)))
 
     def reset(self):
         self.alpha = 255
@@ -499,14 +1561,14 @@ class PointIncrease(PopUpText):
         value = int(self.value)
 
         if value > 0:        
-            text = self.font.render(f"+{value:,}", False, pg.Color('darkgreen'))
+            text = TEXT_CACHE.render(self.font, f"+{value:,}", False, pg.Color('darkgreen'))
         else:
-            text = self.font.render(f"{value:,}", False, pg.Color('red'))
+            text = TEXT_CACHE.render(self.font, f"{value:,}", False, pg.Color('red'))
 
         # Ensures that the point increase text disappears in 3 seconds
         text.set_alpha(self.alpha)
-        self.alpha -= 255 * 1000 / (self.game.fps * TEXT_FADE_TIME)
-        screen.blit(text, (self.x, self.y - self.height))
+        self.alpha -= 255 * self.game.frame_time / TEXT_FADE_TIME
+        self.game.dirty.add(screen.blit(text, (self.x, self.y - self.height)))
 
         if self.alpha <= 0:
             self.reset()
@@ -518,7 +1580,7 @@ class PointIncrease(PopUpText):
 
 class LevelUpText(PopUpText):
     def __init__(self, value, game):
-        font = pg.font.SysFont('Times New Roman', 20)
+        font = FONTS.get('Times New Roman', 20)
         width, height = font.size(value)
         x = WIDTH - width
         y = HEIGHT - FOOTER_HEIGHT - height
@@ -532,11 +1594,11 @@ class LevelUpText(PopUpText):
             self.reset()
 
         # Ensures that the point increase text disappears in 3 seconds
-        text = self.font.render(f"{self.value}", False, pg.Color('black'))
+        text = TEXT_CACHE.render(self.font, f"{self.value}", False, pg.Color('black'))
         width, height = self.font.size(self.value)
         text.set_alpha(self.alpha)
-        self.alpha -= 255 * 1000 / (self.game.fps * TEXT_FADE_TIME)
-        screen.blit(text, (WIDTH-width, HEIGHT - FOOTER_HEIGHT - height))
+        self.alpha -= 255 * self.game.frame_time / TEXT_FADE_TIME
+        self.game.dirty.add(screen.blit(text, (WIDTH-width, HEIGHT - FOOTER_HEIGHT - height)))
 
     def reset(self):
         self.value = ''
@@ -545,12 +1607,12 @@ class LevelUpText(PopUpText):
 
 class PowerupFooterText:
     def __init__(self, powerup, footer):
-        self.font = pg.font.SysFont('Times New Roman', 40)
+        self.font = FONTS.get('Times New Roman', 40)
         self.original_value = powerup.original_value
         self.state = powerup.original_value
         
         self.index_target = 0
-        self.game = game
+        self.game = powerup.game
         self.powerup = powerup
         self.footer = footer
 
@@ -572,34 +1634,378 @@ class PowerupFooterText:
             self.game.powerup_footer_text = None
 
     def draw(self):
-        powerup = self.font.render(self.state, False, pg.Color('red'))
+        powerup = TEXT_CACHE.render(self.font, self.state, False, pg.Color('red'))
         powerup_rect = powerup.get_rect(center=self.footer.center)
-        screen.blit(powerup, powerup_rect)
+        self.game.dirty.add(screen.blit(powerup, powerup_rect))
    
 
+class VirtualClock:
+    """Stands in for pg.time.get_ticks, but only moves on when it is told to."""
+
+    def __init__(self):
+        self.ticks = 0
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def advance(self, ms):
+        self.ticks += ms
+
+
+class Scheduler:
+    """
+    Calls things back once their time is up, keeping them in a heap so a frame only looks at the timers which are
+    due. It has its own clock, which the game only moves on while it's running, so timers wait through pauses.
+    """
+
+    def __init__(self):
+        self.time = 0
+        self.heap = [] # [deadline, order, callback], with the callback set to None once cancelled
+        self.order = 0 # so timers due at the same time go off in the order they were set
+        self.fired = 0
+
+    def __len__(self):
+        return sum(1 for timer in self.heap if timer[2] is not None)
+
+    def __repr__(self):
+        return f"Scheduler({len(self)} timers at {self.time:,.0f}ms, {self.fired:,} fired)"
+
+    def schedule(self, delay, callback):
+        # A timer can't be due before now, and one set while advancing waits for the next advance anyway
+        timer = [self.time + max(0, delay), self.order, callback]
+        self.order += 1
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def cancel(self, timer):
+        """Stops a timer going off, returning how many milliseconds it had left."""
+        timer[2] = None
+        return max(0, timer[0] - self.time)
+
+    def advance(self, dt):
+        self.time += dt
+        first_new = self.order # timers set from here on are left for the next advance, so a timer can't keep re-arming itself
+        deferred = []
+
+        while self.heap and self.heap[0][0] <= self.time:
+            timer = heapq.heappop(self.heap)
+
+            if timer[1] >= first_new:
+                deferred.append(timer)
+            elif timer[2] is not None:
+                self.fired += 1
+                timer[2]()
+
+        for timer in deferred:
+            heapq.heappush(self.heap, timer)
+
+
+class Recording:
+    """
+    A game stored as its random seed, how long every frame took and everything the player pressed, which is enough
+    to play the exact same game again. Saved in a small binary format:
+
+    header: b'WCR', version, seed, difficulty, final score
+    then for each record a one byte code, followed by the frame time in milliseconds or the letter for those two
+    """
+
+    MAGIC = b'WCR'
+    VERSION = 2 # timers stopped running while paused in version 2, so older games play out differently
+    HEADER = struct.Struct('<3sBIBi')
+    VALUE = struct.Struct('<H')
+
+    CODES = {"frame": 0, "letter": 1, "enter_down": 2, "enter_up": 3, "escape": 4, "quit": 5}
+    KINDS = {v:k for k, v in CODES.items()}
+    DIFFICULTIES = ["Difficulty: Easy", "Difficulty: Normal", "Difficulty: Hard", "Difficulty: Gamer"]
+
+    def __init__(self, seed, difficulty, records=None, score=None):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.records = [] if records is None else records # (kind, frame time or letter)
+        self.score = score
+
+    def __repr__(self):
+        return f"Recording({self.difficulty}, seed {self.seed}, {len(self.records)} records, score {self.score})"
+
+    @property
+    def frames(self):
+        return sum(1 for kind, _ in self.records if kind == "frame")
+
+    def add(self, kind, value=None):
+        self.records.append((kind, value))
+
+    def finish(self, score):
+        self.score = score
+
+    def save(self, path):
+        data = bytearray(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.DIFFICULTIES.index(self.difficulty), self.score or 0))
+
+        for kind, value in self.records:
+            data.append(self.CODES[kind])
+
+            if kind == "frame":
+                data += self.VALUE.pack(min(round(value), 0xFFFF))
+            elif kind == "letter":
+                data += self.VALUE.pack(ord(value))
+
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, seed, difficulty, score = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not a version {cls.VERSION} recording")
+
+        records = []
+        pos = cls.HEADER.size
+
+        while pos < len(data):
+            kind = cls.KINDS[data[pos]]
+            pos += 1
+
+            if kind in ["frame", "letter"]:
+                value = cls.VALUE.unpack_from(data, pos)[0]
+                pos += cls.VALUE.size
+                records.append((kind, value if kind == "frame" else chr(value)))
+            else:
+                records.append((kind, None))
+
+        return cls(seed, cls.DIFFICULTIES[difficulty], records, score)
+
+
+class FrameProfiler:
+    """
+    Times each part of a frame. The last few seconds of frames are kept in a ring buffer for the percentiles shown
+    by F3, and every frame is kept so the whole game can be saved to a CSV once it's over.
+    """
+
+    PHASES = ["events", "background", "words", "footer", "popups", "timers", "display"]
+    SIZE = 600 # frames kept for the percentiles, 10 seconds at 60 fps
+    REFRESH = 30 # frames between working the overlay out again
+
+    def __init__(self):
+        self.columns = {phase: idx for idx, phase in enumerate(self.PHASES)}
+        self.ring = np.zeros((self.SIZE, len(self.PHASES)))
+        self.row = [0] * len(self.PHASES)
+        self.history = []
+        self.frames = 0
+        self.last = time.perf_counter()
+
+        self.font = FONTS.get('Courier New', 14)
+        self.show = False
+        self.overlay = None
+
+    def __repr__(self):
+        return f"FrameProfiler({self.frames:,} frames)"
+
+    def begin(self):
+        """Starts the clock for a frame, so waiting for the next one isn't counted."""
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Puts the time since the last mark down to phase."""
+        now = time.perf_counter()
+        self.row[self.columns[phase]] += now - self.last
+        self.last = now
+
+    def end(self):
+        self.ring[self.frames % self.SIZE] = self.row
+        self.history.append(self.row)
+        self.frames += 1
+        self.row = [0] * len(self.PHASES)
+        self.last = time.perf_counter()
+
+    def percentiles(self):
+        """phase: (p50, p95, p99) in milliseconds over the frames in the ring buffer, with the whole frame as total."""
+        frames = self.ring[:min(self.frames, self.SIZE)]
+
+        if len(frames) == 0:
+            return {}
+
+        frames = np.column_stack([frames, frames.sum(axis=1)]) * 1000
+        values = np.percentile(frames, [50, 95, 99], axis=0)
+        return {phase: tuple(float(value) for value in values[:, idx]) for idx, phase in enumerate(self.PHASES + ["total"])}
+
+    def toggle(self):
+        self.show = not self.show
+        self.overlay = None
+
+    def draw(self, game):
+        if not self.show:
+            return
+
+        if self.overlay is None or self.frames % self.REFRESH == 0:
+            lines = [f"{'ms':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for phase, values in self.percentiles().items():
+                lines.append(f"{phase:<10}" + "".join(f"{value:>7.2f}" for value in values))
+
+            height = self.font.get_linesize()
+            self.overlay = pg.Surface((self.font.size(lines[0])[0] + 10, height * len(lines) + 10), pg.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 160))
+
+            for idx, line in enumerate(lines):
+                self.overlay.blit(self.font.render(line, True, (255, 255, 255)), (5, 5 + idx * height))
+
+        game.dirty.add(screen.blit(self.overlay, (5, 5)))
+
+    def save(self, path):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in self.PHASES] + ["total_ms"])
+
+            for idx, row in enumerate(self.history):
+                writer.writerow([idx] + [f"{1000 * value:.4f}" for value in row] + [f"{1000 * sum(row):.4f}"])
+
+    def report(self):
+        return {phase: {"p50": p50, "p95": p95, "p99": p99} for phase, (p50, p95, p99) in self.percentiles().items()}
+
+
+class NullProfiler(FrameProfiler):
+    """Stands in when the game isn't being profiled."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def begin(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end(self):
+        pass
+
+    def toggle(self):
+        pass
+
+    def draw(self, game):
+        pass
+
+
+class DirtyRects:
+    """
+    Remembers what was drawn this frame and last frame, so only the parts of the screen which changed are pushed
+    to the display instead of the whole window.
+    """
+
+    def __init__(self):
+        self.current = []
+        self.previous = []
+        self.full_repaint = True
+        self.pixels = 0 # pixels pushed on the last frame
+        self.total_pixels = 0
+        self.frames = 0
+
+    def __repr__(self):
+        return f"DirtyRects({self.pixels:,} pixels last frame, {self.average_pixels:,.0f} on average)"
+
+    @property
+    def average_pixels(self):
+        return self.total_pixels / self.frames if self.frames else 0
+
+    def add(self, rect):
+        if rect.width > 0 and rect.height > 0:
+            self.current.append(rect)
+
+    def repaint(self):
+        """Push the whole screen on the next update, for when everything changes at once."""
+        self.full_repaint = True
+
+    @staticmethod
+    def merge(rects):
+        """Joins overlapping rects together so the same pixels aren't pushed twice."""
+        merged = []
+
+        for rect in rects:
+            rect = rect.copy()
+            idx = rect.collidelist(merged)
+
+            # Keep growing the rect until it doesn't touch anything else
+            while idx != -1:
+                rect.union_ip(merged.pop(idx))
+                idx = rect.collidelist(merged)
+            merged.append(rect)
+
+        return merged
+
+    def update(self):
+        if self.full_repaint:
+            self.pixels = WIDTH * HEIGHT
+
+            # Has to be called without anything, update(None) updates nothing
+            if not HEADLESS:
+                pg.display.update()
+        else:
+            # Last frame's rects need pushing too, otherwise whatever moved away from them would be left behind
+            rects = self.merge(self.previous + self.current)
+            self.pixels = sum(rect.width * rect.height for rect in rects)
+
+            if not HEADLESS:
+                pg.display.update(rects)
+
+        self.total_pixels += self.pixels
+        self.frames += 1
+        self.previous = self.current
+        self.current = []
+        self.full_repaint = False
+
+    def report(self):
+        return {
+            "pixels": self.pixels,
+            "average_pixels": self.average_pixels,
+            "frames": self.frames
+        }
+
+
 class Game:
-    font = pg.font.SysFont('Times New Roman', 20)
+    font = FONTS.get('Times New Roman', 20)
+    pause_overlay = None
 
-    def __init__(self, difficulty):
+    def __init__(self, difficulty, seed=None, record=False, profile=False):
+        ASSETS.get("words") # loaded in the background, but the game can't start without them
         self.difficulty = difficulty
+
+        # Seeding the game means the same inputs will always play out the same way. It has its own random, so
+        # nothing else using random can change what it spawns
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recording = Recording(self.seed, difficulty) if record else None
+
+        # The game keeps its own time, which only moves on a frame at a time
+        self.ticks = VirtualClock()
+        self.enter_held = False
         self.words = []
         self.word_size = WORD_SIZE
         self.running = True
         self.fps = 60
         self.clock = pg.time.Clock()
+        self.frame_time = 0 # milliseconds the last frame took, for anything that fades
+        self.accumulator = 0 # milliseconds which haven't been simulated yet
         self.spawn_frequency = SPAWN_FREQUENCY
         self.base_speed_multiplier = SPEED_MULTIPLIER
         self.current_speed_multiplier = SPEED_MULTIPLIER
-        self.spawn_timer = pg.time.get_ticks()
+
+        # Timers for powerups and levelling up stop while paused, the ones which spawn words stop while frozen too
+        self.timers = Scheduler()
+        self.spawns = Scheduler()
+        self.expiries = {} # powerup: timer which turns it off again
         self.game_over = False
         self.restarting = False
         self.to_menu = False
+        self.targets = {} # letter: words which need to be hit by that letter next (a dict so the order is kept)
+        self.store = WordStore()
+        self.spawned = 0 # words and powerups spawned this game
+        self.powerups_onscreen = 0
+        self.player = None # called before every frame with the game, for a bot to play it
         
         self.visible_words = False
         
         self.reveal_multiplier = REVEAL_MULTIPLIER * self.base_speed_multiplier # how much the words on the screen speed up by when revealing
         self.reveal_powerup_activated = False
-        self.reveal_timer = pg.time.get_ticks()
 
         self.score = 0
         self.combo = 0
@@ -626,26 +2032,30 @@ class Game:
         self.level_up_text = LevelUpText("", self)
         self.level_up_threshold_multiplier = 1
         self.show_level_up = False
-        self.level_up_timer = pg.time.get_ticks()
 
         self.point_increase = PointIncrease(0, self)
         self.freeze_activated = False
-        self.freeze_timer = pg.time.get_ticks()
 
         self.powerup = None
         self.powerup_footer_text = None
-        self.powerup_clock = 0
         self.powerup_frequency = MAX_POWERUP_FREQUENCY
+        self.powerup_left = self.powerup_frequency # milliseconds until the next powerup, counting only while one can spawn
+        self.powerup_timer = None
         self.redness = 0
 
         self.punch_powerup_activated = False
-        self.punch_timer = pg.time.get_ticks()
         self.punch_multiplier = 1
 
         self.sweep_activated = False
-        self.sweep_timer = pg.time.get_ticks()
 
         self.min_powerup_frequency = MIN_POWERUP_FREQUENCY
+        self.dirty = DirtyRects()
+        self.profiler = FrameProfiler() if profile else NullProfiler()
+        self.retry_cpu = None
+
+        self.update_difficulty()
+        self.spawns.schedule(self.spawn_frequency, self.timed_spawn)
+        self.timers.schedule(LEVEL_UP_TIME, self.timed_level_up)
 
         if self.difficulty != 'Difficulty: Gamer':
             STATS['general']["Games Played"] += 1
@@ -659,17 +2069,64 @@ class Game:
     def punch(self):
         return max(0, (self.streak // 10)) + 1
         
-    def update_words(self):
-        for word in self.words:
-            word.draw()
-            word.move()
+    def update_words(self, dt):
+        """Moves the words in fixed steps for however long the frame took, then draws them part way between steps."""
+
+        self.accumulator += dt
+        steps = 0
+
+        while self.accumulator >= SIMULATION_STEP and steps < MAX_SIMULATION_STEPS:
+            self.store.move(self.current_speed_multiplier)
 
-            if word.is_above_screen:
-                self.words.remove(word)
+            for word in self.store.above_screen():
+                self.remove_word(word)
+
+            self.accumulator -= SIMULATION_STEP
+            steps += 1
+
+        # If the game has fallen too far behind, drop the time instead of trying to catch up forever
+        if steps == MAX_SIMULATION_STEPS:
+            self.accumulator %= SIMULATION_STEP
+
+        self.store.interpolation = self.accumulator / SIMULATION_STEP
+        self.draw_words()
 
     def draw_words(self):
         for word in self.words:
             word.draw()
+
+    def add_word(self, word):
+        self.words.append(word)
+        self.spawned += 1
+        self.target(word)
+
+        if type(word) is Powerup:
+            self.powerups_onscreen += 1
+
+    def remove_word(self, word):
+        self.words.remove(word)
+        self.untarget(word)
+        self.store.remove(word)
+
+        if type(word) is Powerup:
+            self.powerups_onscreen -= 1
+
+    def clear_words(self):
+        self.words.clear()
+        self.targets.clear()
+        self.store.clear()
+        self.powerups_onscreen = 0
+
+    def target(self, word):
+        """Files the word under the next letter it needs to be hit by."""
+        if word.index_target < len(word.original_value):
+            letter = word.original_value[word.index_target]
+            self.targets.setdefault(letter, {})[word] = None
+
+    def untarget(self, word):
+        if word.index_target < len(word.original_value):
+            letter = word.original_value[word.index_target]
+            self.targets.get(letter, {}).pop(word, None)
     
     def reveal_words(self):
         for word in self.words:
@@ -687,9 +2144,18 @@ class Game:
         for word in self.words:
             word.partially_reveal()
 
+    def set_expiry(self, powerup, activated, toggle):
+        """Starts the timer which turns a powerup off again, or stops it when the powerup has been turned off."""
+
+        if powerup in self.expiries:
+            self.timers.cancel(self.expiries.pop(powerup))
+
+        if activated:
+            self.expiries[powerup] = self.timers.schedule(POWERUP_DURATION, toggle)
+
     def toggle_reveal(self):
-        self.reveal_timer = pg.time.get_ticks()
         self.reveal_powerup_activated = not self.reveal_powerup_activated
+        self.set_expiry("reveal", self.reveal_powerup_activated, self.toggle_reveal)
         self.visible_words = not self.visible_words
 
         # Partially means they reveal and hide words respectively but don't clear word damage
@@ -699,12 +2165,12 @@ class Game:
             self.partially_hide_words()
 
     def toggle_punch(self):
-        self.punch_timer = pg.time.get_ticks()
         self.punch_powerup_activated = not self.punch_powerup_activated
+        self.set_expiry("punch", self.punch_powerup_activated, self.toggle_punch)
         
     def toggle_sweep(self):
-        self.sweep_timer = pg.time.get_ticks()
         self.sweep_activated = not self.sweep_activated
+        self.set_expiry("sweep", self.sweep_activated, self.toggle_sweep)
         
     def add_streak(self):
         if self.difficulty != 'Difficulty: Gamer':
@@ -728,19 +2194,18 @@ class Game:
         screen.fill((255, 255-self.redness, 255-self.redness))
 
         if self.redness > 0:
-            self.redness -= (50 * 1000) / (self.fps * POWERUP_DURATION)
+            self.dirty.repaint() # the whole background changes colour
+            self.redness = max(0, self.redness - 50 * self.frame_time / POWERUP_DURATION)
         
 
     def is_special_onscreen(self):
-        for word in self.words:
-            if type(word) is Powerup and word.is_onscreen:
-                return True
-        return False
+        # A powerup can only leave the bottom of the screen by ending the game, so any that haven't been removed count
+        return self.powerups_onscreen > 0
 
     def update_difficulty(self):
         """
         Difficulty threshold is calculated based on the player's current score, but the difficulty of the game is based on how long the game
-        was running for.
+        was running for. Only needs working out again when either level changes.
         """
 
         # This is so that the total needed to level up increase a little bit each time
@@ -758,7 +2223,7 @@ class Game:
         self.draw_bg()
         self.draw_words()
         self.draw_footer()
-        retry = Game.font.render("Press space to retry!", False, pg.Color('black'))
+        retry = TEXT_CACHE.render(Game.font, "Press space to retry!", False, pg.Color('black'))
         retry_rect = retry.get_rect(center=self.footer.center)
         screen.blit(retry, retry_rect)
 
@@ -785,15 +2250,23 @@ class Game:
                 SOUND.play_combo_sfx(3)
         
     def check_game_over(self):
-        return not all(word.is_onscreen for word in self.words)
+        return self.store.any_below(HEIGHT - FOOTER_HEIGHT)
 
-    def pause_game(self):
-        mask = pg.Surface((WIDTH, HEIGHT))
-        screen.fill(pg.Color(pg.Color('black')))
-        pause_font = pg.font.SysFont('Times New Roman', 70)
+    @classmethod
+    def get_pause_overlay(cls):
+        """The pause screen never changes, so it is only drawn once and reused."""
+
+        if cls.pause_overlay is not None:
+            return cls.pause_overlay
+
+        overlay = pg.Surface((WIDTH, HEIGHT))
+        if not HEADLESS:
+            overlay = overlay.convert()
+        overlay.fill(pg.Color('black'))
+        pause_font = FONTS.get('Times New Roman', 70)
         
         text = pause_font.render("paused", False, pg.Color('white'))
-        text_rect = text.get_rect(center=screen.get_rect().center)
+        text_rect = text.get_rect(center=overlay.get_rect().center)
 
         shortcuts = [
             "Press Esc to return to the game",
@@ -802,29 +2275,64 @@ class Game:
         ]
 
         y_pos = 375
-        subtitle_font = pg.font.SysFont('Times new Roman', 20)
+        subtitle_font = FONTS.get('Times New Roman', 20)
         
         for i in shortcuts:
             subtitle = subtitle_font.render(i, False, pg.Color('white'))
             subtitle_rect = subtitle.get_rect(center=(225, y_pos))
-            screen.blit(subtitle, subtitle_rect)
+            overlay.blit(subtitle, subtitle_rect)
             y_pos += 30
         
-        screen.blit(text, text_rect)
+        overlay.blit(text, text_rect)
+        cls.pause_overlay = overlay
+        return overlay
+
+    def pause_game(self):
+        screen.blit(self.get_pause_overlay(), (0, 0))
         
 
     def toggle_freeze(self):
         self.freeze_activated = not self.freeze_activated
-        self.freeze_timer = pg.time.get_ticks()
+        self.set_expiry("freeze", self.freeze_activated, self.toggle_freeze)
+
+    def timed_spawn(self):
+        self.spawn_common_word()
+
+        # spawn_frequency goes below zero from level 50, so spawn at most once a step like before
+        self.spawns.schedule(max(SIMULATION_STEP, self.spawn_frequency), self.timed_spawn)
+
+    def timed_powerup(self):
+        self.powerup_timer = None
+        self.spawn_special_word(DEBUG_POWERUP)
+        self.powerup_frequency = self.rng.randint(self.min_powerup_frequency, self.max_powerup_frequency)
+        self.powerup_left = self.powerup_frequency
+
+        print(f"{self.min_powerup_frequency} < {self.powerup_frequency} < {self.max_powerup_frequency}")
+
+    def timed_level_up(self):
+        self.background_based_level += 1
+        self.update_difficulty()
+        self.timers.schedule(LEVEL_UP_TIME, self.timed_level_up)
+
+    def update_powerup_timer(self):
+        """The powerup timer only counts down while there isn't a powerup on the screen, held or running."""
+
+        ready = not self.is_special_onscreen() and self.powerup is None and not self.punch_powerup_activated and not self.sweep_activated
+
+        if ready and self.powerup_timer is None:
+            self.powerup_timer = self.spawns.schedule(self.powerup_left, self.timed_powerup)
+        elif not ready and self.powerup_timer is not None:
+            self.powerup_left = self.spawns.cancel(self.powerup_timer)
+            self.powerup_timer = None
         
     def draw_footer(self):
         # Draw the footer with a black border
         pg.draw.rect(screen, pg.Color('black'), pg.Rect(0, HEIGHT-FOOTER_HEIGHT, WIDTH, FOOTER_HEIGHT), 0)
         self.footer = pg.draw.rect(screen, (255, 255-self.redness, 255-self.redness), pg.Rect(0, HEIGHT-FOOTER_HEIGHT+1, WIDTH, FOOTER_HEIGHT), 0)
         
-        score = Game.font.render(f"Score: {self.score:,}", False, pg.Color('black'))
+        score = TEXT_CACHE.render(Game.font, f"Score: {self.score:,}", False, pg.Color('black'))
         score_rect = score.get_rect(midleft=(10, HEIGHT - (FOOTER_HEIGHT//2)))
-        screen.blit(score, score_rect)
+        self.dirty.add(screen.blit(score, score_rect))
         
         if self.streak >= 10:
             self.streak_text.set_value(f"Streak: {self.streak}!")
@@ -840,15 +2348,16 @@ class Game:
         
     def update(self, dt):
         if not self.is_paused:
-            now = pg.time.get_ticks()
             if self.freeze_activated:
                 self.draw_words()
             else:
-                self.update_words()
+                self.update_words(dt)
+            self.profiler.mark("words")
 
             if self.powerup_footer_text:
                 self.powerup_footer_text.draw()
             self.draw_footer()
+            self.profiler.mark("footer")
 
             if self.punch_powerup_activated:
                 self.punch_multiplier = 25
@@ -861,131 +2370,135 @@ class Game:
             if self.score >= self.level_up_threshold:
                 self.level_up_text.set_value("Level Up!")
                 self.score_based_level += 1
+                self.update_difficulty()
 
             # Check if score is enough to level down
             elif self.score < BASE_LEVEL_UP_THRESHOLD + (LEVEL_UP_THRESHOLD_INCREASE * (self.score_based_level-1)):
                 self.level_up_text.set_value("Level Down!")
                 self.score_based_level -= 1
+                self.update_difficulty()
 
             if self.level_up_text.value != '':
                 self.level_up_text.draw()
-                    
-            self.update_difficulty()
+            self.profiler.mark("popups")
 
 
             ### TIMERS ###
-            if not self.freeze_activated:
-                # Spawn new words at the rate of the spawn frequency
-                if now - self.spawn_timer > self.spawn_frequency:
-                    self.spawn_timer = now
-                    word = self.spawn_common_word()
-                    
-                # Spawn a special word powerup (this is different to other timers since we don't want it to tick all the time)
-                if self.powerup_clock > self.powerup_frequency:
-                    self.powerup_clock = 0
-                    self.spawn_special_word(DEBUG_POWERUP)
-                    self.powerup_frequency = random.randint(self.min_powerup_frequency, self.max_powerup_frequency)
+            self.timers.advance(dt)
 
-                    print(f"{self.min_powerup_frequency} < {self.powerup_frequency} < {self.max_powerup_frequency}")
-
-                if not self.is_special_onscreen() and self.powerup is None and not self.punch_powerup_activated and not self.sweep_activated:
-                    self.powerup_clock += dt
-                    
-            if now - self.level_up_timer > 30000:
-                self.level_up_timer = now
-                self.background_based_level += 1
-                
-            if self.freeze_activated and (now - self.freeze_timer > POWERUP_DURATION or len(self.words) == 0):
-                self.freeze_timer = now
+            if self.freeze_activated and len(self.words) == 0:
                 self.toggle_freeze()
 
-            if self.reveal_powerup_activated and now - self.reveal_timer > POWERUP_DURATION:
-                self.toggle_reveal()
-
-            if self.punch_powerup_activated and now - self.punch_timer > POWERUP_DURATION:
-                self.punch_timer = now
-                self.toggle_punch()
-
-            if self.sweep_activated and now - self.sweep_timer > POWERUP_DURATION:
-                self.sweep_timer = now
-                self.toggle_sweep()
+            if not self.freeze_activated:
+                self.update_powerup_timer()
+                self.spawns.advance(dt)
+            self.profiler.mark("timers")
                     
             if int(self.point_increase.value) != 0:
                 self.point_increase.draw()
+            self.profiler.mark("popups")
 
             if self.check_game_over():
                 self.game_over = True
                 self.reveal_words()
                 self.powerup_footer_text = None
                 SOUND.play('gameover')
+            self.profiler.mark("words")
         else:
             self.pause_game()
+            self.dirty.repaint()
+            self.profiler.mark("popups")
 
             
     def event_loop(self):
-        keys = pg.key.get_pressed()
-        
         for event in pg.event.get():
             if event.type == pg.QUIT:
-                self.game_over = True
-                self.running = False
-                self.quitting = True
+                self.handle_input("quit")
 
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
-                    self.is_paused = not self.is_paused
+                    self.handle_input("escape")
+                elif event.key in ENTER_CHARACTERS:
+                    self.handle_input("enter_down")
+                elif event.key == pg.K_F3:
+                    self.profiler.toggle() # not part of the game, so it isn't recorded
+                elif event.unicode.isalpha():
+                    self.handle_input("letter", event.unicode.lower())
 
-                    if self.is_paused:
-                        SOUND.play('pause')
-                        MUSIC.play("filter")
-                    else:
-                        SOUND.play('resume')
-                        MUSIC.play("normal")
+            if event.type == pg.KEYUP:
+                if event.key in ENTER_CHARACTERS:
+                    self.handle_input("enter_up")
 
-                if self.is_paused:
-                    if event.unicode.lower() == 'r':
-                        self.game_over = True
-                        self.restarting = True
-                        self.running = False
-                        SOUND.play('resume')
-                    elif event.unicode.lower() == 'q':
-                        self.game_over = True
-                        self.restarting = True
-                        self.running = False
-                        self.quitting = True
-                        self.to_menu = True
-                        SOUND.play('resume')
-                        
+    def handle_input(self, kind, letter=None):
+        """Everything the player does in a game goes through here, so that it can be recorded and replayed."""
 
-                if not self.is_paused:
-                    if event.key in ENTER_CHARACTERS and not self.reveal_powerup_activated: # enter key
-                        self.reveal_words()
-                        self.visible_words = True
-                        self.current_speed_multiplier += self.reveal_multiplier
-                        SOUND.play('reveal')
-                        self.add_streak()
+        if self.recording is not None:
+            self.recording.add(kind, letter)
+
+        if kind == "quit":
+            self.game_over = True
+            self.running = False
+            self.quitting = True
+
+        elif kind == "escape":
+            self.is_paused = not self.is_paused
+
+            if self.is_paused:
+                SOUND.play('pause')
+                MUSIC.play("filter")
+            else:
+                SOUND.play('resume')
+                MUSIC.play("normal")
+                self.dirty.repaint()
 
-                        if self.difficulty != 'Difficulty: Gamer':
-                            STATS['general']["Number of Reveals"] += 1
+        elif kind == "enter_down":
+            self.enter_held = True
 
-                        if self.powerup_footer_text:
-                            self.powerup_footer_text.reset()
-                        
-                        
-                    # You shouldn't be able to type while the enter key is pressed
-                    if event.unicode.isalpha() and not keys[pg.K_RETURN] and not keys[pg.K_KP_ENTER]:
-                        current_letter = event.unicode.lower()
-                        self.damage_words(current_letter)
+            if not self.is_paused and not self.reveal_powerup_activated:
+                self.reveal_words()
+                self.visible_words = True
+                self.current_speed_multiplier += self.reveal_multiplier
+                SOUND.play('reveal')
+                self.add_streak()
+
+                if self.difficulty != 'Difficulty: Gamer':
+                    STATS['general']["Number of Reveals"] += 1
+
+                if self.powerup_footer_text:
+                    self.powerup_footer_text.reset()
+
+        elif kind == "enter_up":
+            self.enter_held = False
+
+            if not self.reveal_powerup_activated:
+                self.current_speed_multiplier = self.base_speed_multiplier
+                self.visible_words = False
+                self.hide_words()
+
+        elif kind == "letter":
+            if self.is_paused:
+                if letter == 'r':
+                    self.game_over = True
+                    self.restarting = True
+                    self.running = False
+                    SOUND.play('resume')
+                elif letter == 'q':
+                    self.game_over = True
+                    self.restarting = True
+                    self.running = False
+                    self.quitting = True
+                    self.to_menu = True
+                    SOUND.play('resume')
 
-            if event.type == pg.KEYUP:
-                if event.key in ENTER_CHARACTERS and not self.reveal_powerup_activated:
-                    self.current_speed_multiplier = self.base_speed_multiplier
-                    self.visible_words = False
-                    self.hide_words()
+            # You shouldn't be able to type while the enter key is pressed
+            elif not self.enter_held:
+                self.damage_words(letter)
                     
 
     def await_retry(self):
-        for event in pg.event.get():
+        events = wait_for_events()
+
+        for event in events:
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_SPACE:
                     self.running = False
@@ -1000,6 +2513,7 @@ class Game:
                     else:
                         SOUND.play('resume')
                         MUSIC.play("normal")
+                        self.dirty.repaint()
 
                 if self.is_paused:
                     if event.unicode.lower() == 'r':
@@ -1019,9 +2533,11 @@ class Game:
                 self.game_over = True
                 self.running = False
                 self.quitting = True
+
+        return len(events) > 0
                 
     def spawn_common_word(self):
-        x = random.randint(1, self.word_difficulty)
+        x = self.rng.randint(1, self.word_difficulty)
 
         if x > 20:
             word_list = boss_words
@@ -1030,21 +2546,21 @@ class Game:
         else:
             word_list = common_words
             
-        word = Word(random.sample(word_list, 1)[0], self)
+        word = Word(self.rng.sample(word_list, 1)[0], self)
         word.draw()
-        self.words.append(word)
+        self.add_word(word)
         return word
 
     def spawn_special_word(self, special_type=None):
         """Spawn in a random powerup!"""
 
         if special_type is None:
-            special_type = random.choice(list(SPECIAL_TYPES.keys()))
+            special_type = self.rng.choice(list(SPECIAL_TYPES.keys()))
 
         #word = Powerup('bomb', 'explosion', game)
-        word = Powerup(special_type, random.choice(SPECIAL_TYPES[special_type]), game)
+        word = Powerup(special_type, self.rng.choice(SPECIAL_TYPES[special_type]), self)
         word.draw()
-        self.words.append(word)
+        self.add_word(word)
 
     def damage_words(self, current_letter):
         self.hit_letter = False
@@ -1053,7 +2569,8 @@ class Game:
         if self.powerup_footer_text:
             self.powerup_footer_text.damage(current_letter)
             
-        for word in self.words.copy():
+        # Only the words waiting on this letter can be hit by it
+        for word in list(self.targets.get(current_letter, ())):
             word.damage(current_letter)
 
 
@@ -1061,7 +2578,7 @@ class Game:
         if self.hit_letter:
             self.streak += 1
             if self.punch_powerup_activated or self.sweep_activated:
-                SOUND.play_powerup_sfx('punch')
+                SOUND.play_powerup_sfx('punch', 'hit') # stands in for the hit sound, so it's no more important
             else:
                 SOUND.play('hit')
             self.play_streak_sound()
@@ -1085,34 +2602,80 @@ class Game:
             STATS['general']["Highest Score"] = max(STATS['general']["Highest Score"], self.score)
 
 
-    def run(self):
-        dt = self.clock.tick(self.fps)
-        self.update(dt)
+    def start(self):
+        self.update(0)
         self.spawn_common_word()
+
+    def frame(self, dt, was_paused=False):
+        """Moves the game's clock on by dt milliseconds, then updates and draws everything."""
+
+        if self.recording is not None:
+            self.recording.add("frame", dt)
+
+        self.ticks.advance(dt)
+        self.frame_time = dt
+
+        # Time spent on the pause screen shouldn't be simulated once the game carries on
+        if was_paused:
+            dt = 0
+
+        self.profiler.mark("events")
+        self.draw_bg()
+        self.profiler.mark("background")
+        self.update(dt)
+        self.profiler.draw(self)
+        self.profiler.mark("popups")
+        self.dirty.update()
+        self.profiler.mark("display")
+        self.profiler.end()
+
+    def run(self):
+        self.clock.tick()
+        self.start()
+        redraw = True
         
         while self.running:
             while not self.game_over:
-                dt = self.clock.tick(self.fps)
+                dt = self.clock.tick(PAUSED_FPS if self.is_paused else self.fps)
+                self.profiler.begin()
+                was_paused = self.is_paused
                 self.event_loop()
-                self.draw_bg()
-                self.update(dt)
-                pg.display.update()
 
+                if self.player is not None:
+                    self.player(self)
+
+                self.frame(dt, was_paused)
+
+            if self.recording is not None and self.recording.score is None:
+                self.recording.finish(self.score)
+
+            # Nothing moves on the retry screen, so only redraw it after the player does something
             if not self.restarting:
-                self.await_retry()
-                self.retry_screen()
+                if self.retry_cpu is None:
+                    self.retry_cpu = CpuMeter()
 
-                if self.is_paused:
-                    self.pause_game()
-                
+                if redraw:
+                    self.frame_time = self.clock.tick()
+                    self.retry_screen()
+
+                    if self.is_paused:
+                        self.pause_game()
                     
-                pg.display.update()
+                    self.dirty.repaint()
+                    self.dirty.update()
+
+                redraw = self.await_retry()
+                self.clock.tick() # waiting for the player isn't part of the next frame
+
+        # Should be close to nothing while it's waiting for the player
+        if self.retry_cpu is not None:
+            IDLE_CPU["retry"] = self.retry_cpu.usage
         
 
 class MenuWord:
     
     def __init__(self, value, menu):
-        self.font = pg.font.SysFont('Times New Roman', 50)
+        self.font = FONTS.get('Times New Roman', 50)
         self.width, self.height = self.font.size(value) # dimensions of the rendered word
         self.state = value
         self.menu = menu
@@ -1127,7 +2690,7 @@ class MenuWord:
         return f"MenuWord({self.state})"
 
     def draw(self):
-        text = self.font.render(self.state, False, self.color)
+        text = TEXT_CACHE.render(self.font, self.state, False, self.color)
         screen.blit(text, (self.x, self.y))
 
     @property
@@ -1170,31 +2733,31 @@ class MainMenu:
         self.clock = pg.time.Clock()
         self.spawn_frequency = 1000
         MUSIC.play("menu")
+        self.create_buttons()
 
-    def draw_bg(self):
-        screen.fill((255, 255, 255))
-
-    def draw_title(self):
-        font = pg.font.SysFont('Times New Roman', 50)
-        text = font.render("Word Crusher", False, pg.Color('black'))
-        text_rect = text.get_rect()
-        text_rect.center = (WIDTH//2, 140)
-        screen.blit(text, text_rect)
+    def create_buttons(self):
+        """The buttons are made once for the menu and only redrawn when they change."""
 
-    def draw_buttons(self):
         button_x = (WIDTH // 2) - (self.button_width // 2)
         button_y = 210
         button_margin = 25
 
         for value in ["Play", "Instructions", "Stats", "Quit"]:
             button = Button(button_x, button_y, self.button_width, self.button_height, value)
-
-            is_pressed = button == self.button_pressed
-            button.draw(is_pressed)
             button_y += button.height + button_margin
             self.buttons[value] = button
 
-    def draw_cycle_buttons(self):
+        width, height = 40, 40
+        button_margin = 10
+
+        button_x = WIDTH - button_margin - width
+        button_y = button_margin
+
+        for value in ["SFX", "Music"]:
+            button = ToggleButton(button_x, button_y, width, height, self, value)
+            button_x -= (width + button_margin)
+            self.buttons[value] = button
+
         margin = 10
         height = 35
 
@@ -1203,25 +2766,44 @@ class MainMenu:
 
         for title, value_list, coords in [difficulty, songs]:
             x, y = coords
-            button = CycleButton(x, y, height, title, values=value_list)
-            
-            is_pressed = self.button_pressed == button
-            button.draw(is_pressed)
-            self.buttons[title] = button
+            self.buttons[title] = CycleButton(x, y, height, title, values=value_list)
 
-    def draw_sound_buttons(self):
-        width, height = 40, 40
-        button_margin = 10
+        self.index_buttons()
 
-        button_x = WIDTH - button_margin - width
-        button_y = button_margin
+    def index_buttons(self):
+        """Needs calling again whenever a button changes size."""
+        self.button_list = list(self.buttons.values())
+        self.button_rects = [button.rect for button in self.button_list]
+
+    def button_at(self, pos):
+        idx = pg.Rect(pos, (1, 1)).collidelist(self.button_rects)
+        if idx == -1:
+            return None
+        return self.button_list[idx]
+
+    def draw_bg(self):
+        screen.fill((255, 255, 255))
+
+    def draw_title(self):
+        font = FONTS.get('Times New Roman', 50)
+        text = TEXT_CACHE.render(font, "Word Crusher", False, pg.Color('black'))
+        text_rect = text.get_rect()
+        text_rect.center = (WIDTH//2, 140)
+        screen.blit(text, text_rect)
+
+    def draw_buttons(self):
+        for value in ["Play", "Instructions", "Stats", "Quit"]:
+            button = self.buttons[value]
+            button.draw(button == self.button_pressed)
+
+    def draw_cycle_buttons(self):
+        for title in ["Difficulty", "Song"]:
+            button = self.buttons[title]
+            button.draw(button == self.button_pressed)
 
+    def draw_sound_buttons(self):
         for value in ["SFX", "Music"]:
-            
-            button = ToggleButton(button_x, button_y, width, height, menu, value)
-            button.draw()
-            button_x -= (width + button_margin)
-            self.buttons[value] = button
+            self.buttons[value].draw()
 
     def update_words(self):
         for word in self.words:
@@ -1231,13 +2813,24 @@ class MainMenu:
 
     def draw_credits(self):
         credit = "Created by LuckyLootCrate#2927"
-        font = pg.font.SysFont('Times New Roman', 15)
+        font = FONTS.get('Times New Roman', 15)
         
         width, height = font.size(credit)
-        name = font.render(credit, 1, pg.Color('black'))
+        name = TEXT_CACHE.render(font, credit, 1, pg.Color('black'))
         screen.blit(name, (WIDTH-width, HEIGHT-height))
 
 
+    def draw_loading(self):
+        if not ASSETS.loading:
+            return
+
+        font = FONTS.get('Times New Roman', 15)
+        text = TEXT_CACHE.render(font, f"Loading {ASSETS.progress:.0%}", 1, pg.Color('black'))
+        screen.blit(text, (5, HEIGHT - text.get_height()))
+
+        # A bar along the bottom of the screen which fills up as things load
+        pg.draw.rect(screen, pg.Color('black'), pg.Rect(0, HEIGHT - 3, round(WIDTH * ASSETS.progress), 3))
+
     def update(self, dt):
         self.spawn_clock += dt
         if self.spawn_clock > self.spawn_frequency:
@@ -1254,41 +2847,41 @@ class MainMenu:
                 self.quit()
                 
             if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                for button in self.buttons.values():
-                    if button.is_mouse_over():
-                        self.button_pressed = button
-                        SOUND.play('reveal')
+                button = self.button_at(event.pos)
+
+                if button is not None:
+                    self.button_pressed = button
+                    SOUND.play('reveal')
 
-                        # If the toggle buttons are activated
-                        if button in ToggleButton.STATES:
-                            if button.is_activated:
-                                if button.value == 'Music':
-                                    MUSIC.unmute()
-                                    MUSIC.play('menu')
-                                elif button.value == 'SFX':
-                                    SOUND.unmute()
-                                button.toggle()
-                            else:
-                                if button.value == 'Music':
-                                    MUSIC.mute()
-                                elif button.value == 'SFX':
-                                    SOUND.mute()
-                                button.toggle()
-
-                        elif button in CycleButton.STATES:
-                            if button.title == "Song":
-                                MUSIC.rotate_song()
-                            button.rotate_value()
-                            break
-                        break # Needed so that the sound effect doesn't play a bajillion times
+                    # If the toggle buttons are activated
+                    if isinstance(button, ToggleButton):
+                        if button.is_activated:
+                            if button.value == 'Music':
+                                MUSIC.unmute()
+                                MUSIC.play('menu')
+                            elif button.value == 'SFX':
+                                SOUND.unmute()
+                            button.toggle()
+                        else:
+                            if button.value == 'Music':
+                                MUSIC.mute()
+                            elif button.value == 'SFX':
+                                SOUND.mute()
+                            button.toggle()
+
+                    elif isinstance(button, CycleButton):
+                        if button.title == "Song":
+                            ASSETS.get("music") # the first song has to have started before it can be changed
+                            MUSIC.rotate_song()
+                        button.rotate_value()
+                        self.index_buttons()
                                 
 
             if event.type == pg.MOUSEBUTTONUP and event.button == 1:
-                for button in self.buttons.values():
-                    if button.is_mouse_over():
-                        if self.button_pressed == button and button not in ToggleButton.STATES and button not in CycleButton.STATES:
-                            self.quit()
-                            break         
+                button = self.button_at(event.pos)
+
+                if button is not None and self.button_pressed == button and not isinstance(button, (ToggleButton, CycleButton)):
+                    self.quit()
                 else:
                     self.button_pressed = None
 
@@ -1312,6 +2905,9 @@ class MainMenu:
             SOUND.play('destroy')
 
     def spawn_word(self):
+        if not ASSETS.ready("words"):
+            return
+
         word = MenuWord(random.sample(common_words, 1)[0], self)
         word.draw()
         self.words.append(word)
@@ -1321,28 +2917,35 @@ class MainMenu:
         self.running = False
         self.quitting = True
                 
+    def draw(self, dt):
+        self.draw_bg()
+        self.update(dt)
+        
+        self.draw_title()
+        self.draw_buttons()
+        self.draw_sound_buttons()
+        self.draw_cycle_buttons()
+        self.draw_loading()
+
     def run(self):
         while self.running:
             dt = self.clock.tick(self.fps)
-            self.draw_bg()
-            self.update(dt)
-            
-            self.draw_title()
-            self.draw_buttons()
-            self.draw_sound_buttons()
-            self.draw_cycle_buttons()
+            self.draw(dt)
             self.event_loop()
             pg.display.update()
+            ASSETS.shown_menu()
 
 
 class Button:
     def __init__(self, x, y, width, height, value=''):
-        self.font = pg.font.SysFont('Times New Roman', 20)
+        self.font = FONTS.get('Times New Roman', 20)
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.value = value
+        self.surface = None
+        self.surface_key = None
         
 
     def __repr__(self):
@@ -1354,20 +2957,38 @@ class Button:
     def __hash__(self):
         return hash((self.x, self.y))
 
-    def draw(self, is_pressed=False):
+    @property
+    def rect(self):
+        return pg.Rect(self.x, self.y, self.width, self.height)
+
+    def render(self, is_pressed):
+        """Draws the button and its 2 pixel border onto its own surface."""
+
+        surface = pg.Surface((self.width+4, self.height+4), pg.SRCALPHA)
         roundedness = 10
-        pg.draw.rect(screen, pg.Color('black'), (self.x-2, self.y-2, self.width+4, self.height+4), 2, roundedness)
+        pg.draw.rect(surface, pg.Color('black'), (0, 0, self.width+4, self.height+4), 2, roundedness)
 
         if is_pressed:
             fill_color = pg.Color('lightgrey')
         else:
             fill_color = pg.Color('white')
             
-        pg.draw.rect(screen, fill_color, (self.x, self.y, self.width, self.height), 0, roundedness)
+        pg.draw.rect(surface, fill_color, (2, 2, self.width, self.height), 0, roundedness)
 
         if self.value != '':
             text = self.font.render(self.value, 1, pg.Color('black'))
-            screen.blit(text, (self.x + (self.width/2 - text.get_width()/2), self.y + (self.height/2 - text.get_height()/2)))
+            surface.blit(text, (2 + (self.width/2 - text.get_width()/2), 2 + (self.height/2 - text.get_height()/2)))
+
+        return surface
+
+    def draw(self, is_pressed=False):
+        # Only draw the button again when it looks different to last time
+        key = (self.value, self.width, is_pressed)
+        if key != self.surface_key:
+            self.surface = self.render(is_pressed)
+            self.surface_key = key
+
+        screen.blit(self.surface, (self.x-2, self.y-2))
             
     def is_mouse_over(self):
         pos = pg.mouse.get_pos()
@@ -1378,71 +2999,55 @@ class Button:
 
 
 class ToggleButton(Button):
-    STATES = {}
+    STATES = {} # value: whether the button is toggled on
     
     def __init__(self, x, y, width, height, menu, value=''):
         super().__init__(x, y, width, height, value)
-        self.font = pg.font.SysFont('Times New Roman', 15)
+        self.font = FONTS.get('Times New Roman', 15)
 
-        if self not in self.STATES:
-            self.STATES[self] = False
+        if value not in self.STATES:
+            self.STATES[value] = False
         
 
     def draw(self):
-        roundedness = 10
-        pg.draw.rect(screen, pg.Color('black'), (self.x-2, self.y-2, self.width+4, self.height+4), 2, roundedness)
-
-        if self.is_activated:
-            fill_color = pg.Color('lightgrey')
-        else:
-            fill_color = pg.Color('white')
-            
-        pg.draw.rect(screen, fill_color, (self.x, self.y, self.width, self.height), 0, roundedness)
-
-        if self.value != '':
-            text = self.font.render(self.value, 1, pg.Color('black'))
-            screen.blit(text, (self.x + (self.width/2 - text.get_width()/2), self.y + (self.height/2 - text.get_height()/2)))
+        super().draw(self.is_activated)
 
     @property
     def is_activated(self):
-        return self.STATES[self]
+        return self.STATES[self.value]
         
     def toggle(self):
-        state = self.STATES[self]
-        self.STATES[self] = not state
+        state = self.STATES[self.value]
+        self.STATES[self.value] = not state
 
 
 class CycleButton(Button):
-    STATES = {} # Button: index of the state
+    STATES = {} # title: index of the state
     
     def __init__(self, x, y, height, title, values):
-        """No width is given so that it can be calculated in this __init__ function."""
+        """No width is given so that it can be calculated from the value."""
 
-        self.font = pg.font.SysFont('Times New Roman', 15)
+        super().__init__(x, y, 0, height)
         self.values = values
-        self.x = x
-        self.y = y
         self.title = title
 
-        # Get the index stored from STATES if the button exists
+        # Get the index stored from STATES if the button existed before
         # If not, get the first element as default
-        for button in self.STATES:
-            if button.values == self.values:
-                self.value = self.values[self.STATES[button]]
-                break
-        else:
-            self.value = self.values[0]
-            self.STATES[self] = 0
+        if title not in self.STATES:
+            self.STATES[title] = 0
 
-        self.value = f"{self.title}: {self.value}"
-        width = self.font.size(self.value)[0]
+        self.update_value()
+
+    def update_value(self):
+        self.value = f"{self.title}: {self.values[self.STATES[self.title]]}"
+        width = FONTS.get('Times New Roman', 15).size(self.value)[0]
         margin = 10
-        super().__init__(x, y, width+(margin*5), height, self.value)
-        
+        self.width = width+(margin*5)
 
     def rotate_value(self): 
-        val = self.STATES[self]
-        self.STATES[self] = (val+1) % len(self.values)
+        val = self.STATES[self.title]
+        self.STATES[self.title] = (val+1) % len(self.values)
+        self.update_value()
 
     
 class PageTemplate:
@@ -1455,6 +3060,7 @@ class PageTemplate:
         self.button_height = 50
         self.button_pressed = ''
         self.button_values = ['Previous', 'Menu', 'Next']
+        self.cpu = None
 
     def draw_bg(self):
         screen.fill(pg.Color('white'))
@@ -1480,7 +3086,9 @@ class PageTemplate:
                 
 
     def event_loop(self):
-        for event in pg.event.get():
+        events = wait_for_events()
+
+        for event in events:
             if event.type == pg.QUIT:
                 self.quit()
                 
@@ -1501,26 +3109,148 @@ class PageTemplate:
                             self.running = False
                 
                 self.button_pressed = ''
+
+        return len(events) > 0
             
     def run(self):
+        self.cpu = CpuMeter()
+        redraw = True
+
+        # The pages only change when a button is pressed, so wait for input instead of redrawing every frame
         while self.running:
-            self.event_loop()
-            self.draw_bg()
-            self.draw_buttons()
-            pg.display.update()
+            if redraw:
+                self.draw_bg()
+                self.draw_buttons()
+                pg.display.update()
+            redraw = self.event_loop()
+
+        IDLE_CPU[type(self).__name__] = self.cpu.usage
 
     def quit(self):
         self.running = False
         self.quitting = True
 
 
+class PageImageCache:
+    """
+    Keeps a small window of instruction pages decoded and converted to the display format, and loads the pages either
+    side of the current one on a background thread.
+    """
+
+    def __init__(self, window=1):
+        self.window = window # how many pages either side of the current page to keep around
+        self.images = {} # path: Surface ready to be blitted
+        self.decoded = {} # path: Surface loaded by the background thread, but not converted yet
+        self.queued = set()
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = None
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0 # misses which the background thread had already loaded
+        self.loads = 0
+
+    def __repr__(self):
+        return f"PageImageCache({len(self.images)} resident, {self.loads} loads, {self.hits} hits, {self.misses} misses, {self.prefetched} prefetched)"
+
+    def loader(self):
+        while True:
+            path = self.queue.get()
+            try:
+                self.load(path)
+            finally:
+                self.queue.task_done()
+
+    def load(self, path):
+        with self.lock:
+            wanted = path in self.queued
+        if not wanted:
+            return
+
+        try:
+            image = pg.image.load(path)
+        except pg.error:
+            image = None
+
+        with self.lock:
+            # The player might have moved on while this was loading
+            if path in self.queued:
+                self.queued.discard(path)
+                if image is not None:
+                    self.decoded[path] = image
+                    self.loads += 1
+
+    def wait(self):
+        """Blocks until the background thread has loaded everything queued so far."""
+        self.queue.join()
+
+    def prefetch(self, path):
+        with self.lock:
+            if path in self.images or path in self.decoded or path in self.queued:
+                return
+            self.queued.add(path)
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loader, daemon=True)
+            self.thread.start()
+        self.queue.put(path)
+
+    @staticmethod
+    def prepare(image):
+        # Pages are always drawn on white, so flatten them onto it once instead of alpha blending every frame
+        page = pg.Surface(image.get_size()).convert()
+        page.fill(pg.Color('white'))
+        page.blit(image, (0, 0))
+        return page
+
+    def get(self, path):
+        try:
+            image = self.images[path]
+            self.hits += 1
+            return image
+        except KeyError:
+            self.misses += 1
+
+        with self.lock:
+            image = self.decoded.pop(path, None)
+            self.queued.discard(path)
+
+        # Not prefetched (or still loading), so just load it now
+        if image is None:
+            image = pg.image.load(path)
+            self.loads += 1
+        else:
+            self.prefetched += 1
+
+        image = self.prepare(image)
+        self.images[path] = image
+        return image
+
+    def focus(self, paths, index):
+        """Keeps the pages around paths[index] resident, drops the rest and starts loading the neighbours."""
+        keep = paths[max(0, index-self.window):index+self.window+1]
+
+        with self.lock:
+            for dct in [self.images, self.decoded]:
+                for path in list(dct):
+                    if path not in keep:
+                        del dct[path]
+            self.queued.intersection_update(keep)
+
+        # Load the current page first, then the ones next to it
+        for path in sorted(keep, key=lambda path: abs(paths.index(path) - index)):
+            self.prefetch(path)
+
+PAGE_IMAGES = PageImageCache()
+
+
 class Page:
     def __init__(self, path, is_image, title, lines):
         self.path = path
         self.is_image = is_image
         self.title = title
         self.lines = lines
-        self.line_font = pg.font.SysFont('Times new Roman', 20)
+        self.line_font = FONTS.get('Times New Roman', 20)
         self.line_y_pos = 90
         
     @classmethod
@@ -1537,16 +3267,16 @@ class Page:
         """Style should be either 'list' or 'grid'."""
         
         if self.is_image:
-            page = pg.image.load(self.path)
+            page = PAGE_IMAGES.get(self.path)
             screen.blit(page, (0, 0))
         else:
             font_size = 40
-            font = pg.font.SysFont("Times New Roman", font_size)
+            font = FONTS.get('Times New Roman', font_size)
 
             # Keep shrinking title until it fits on screen
             while font.size(self.title)[0] > WIDTH:
                 font_size -= 5
-                font = pg.font.SysFont("Times New Roman", font_size)
+                font = FONTS.get('Times New Roman', font_size)
 
             # Put title in the middle of the screen
             title = font.render(self.title, False, pg.Color('black'))
@@ -1589,20 +3319,44 @@ class Page:
                 y_pos += 30
 
             x_pos = WIDTH - margin - longest_width
+
+
+def load_pages():
+    """The instruction pages, with the first one's image already loading in for when they're opened."""
+    pages = []
+    for idx, file in enumerate(os.listdir(PAGES_PATH)):
+        path = os.path.join(PAGES_PATH, file)
+        page = Page.load_from_img(path)
+        pages.append(page)
+
+    if pages:
+        PAGE_IMAGES.prefetch(pages[0].path)
+    return pages
+
+ASSETS.add("pages", load_pages, 0)
+
     
 class Instructions(PageTemplate):
     def __init__(self, pages):
         super().__init__()
         self.pages = pages
+        self.focused_page = None
         
 
     def draw_bg(self):
         screen.fill(pg.Color('white'))
+
+        if self.focused_page != self.page_number:
+            self.focused_page = self.page_number
+            PAGE_IMAGES.focus([page.path for page in self.pages], self.page_number - 1)
+
         bg = self.pages[self.page_number - 1]
         bg.draw()
 
     def event_loop(self):
-        for event in pg.event.get():
+        events = wait_for_events()
+
+        for event in events:
             if event.type == pg.QUIT:
                 self.quit()
                 
@@ -1628,6 +3382,8 @@ class Instructions(PageTemplate):
                 
                 self.button_pressed = ''
 
+        return len(events) > 0
+
 
 class Stats(PageTemplate):
     def __init__(self):
@@ -1692,14 +3448,457 @@ class Stats(PageTemplate):
         ]
             
 
+class Typist:
+    """
+    A bot which plays the game by typing at the lowest word on the screen, so the game can be pushed to levels that
+    nobody can reach by hand. It types at wpm words per minute (5 letters to a word), hits the wrong letter
+    error_rate of the time and holds enter for reveal_time milliseconds to peek at reveal_rate of the words it goes
+    for. Everything goes through game.handle_input, just like the keyboard, so its games can be recorded too.
+    """
+
+    LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+    def __init__(self, wpm=80, error_rate=0.05, reveal_rate=0.1, reveal_time=300, seed=None):
+        self.wpm = wpm
+        self.interval = 60 * 1000 / (wpm * 5) # milliseconds between keystrokes
+        self.error_rate = error_rate
+        self.reveal_rate = reveal_rate
+        self.reveal_time = reveal_time
+        self.random = random.Random(seed) # its own random so it doesn't change what the game spawns
+
+        self.game = None
+        self.target = None
+        self.next_key = 0 # game time of the next keystroke
+        self.reveal_until = None # game time to let go of enter, while it's held
+
+        self.keystrokes = 0
+        self.errors = 0
+        self.reveals = 0
+        self.keystroke_time = 0 # seconds spent handling the letters typed
+        self.slowest_keystroke = 0
+
+    def __call__(self, game):
+        if game is not self.game:
+            self.game = game
+            self.target = None
+            self.next_key = 0
+            self.reveal_until = None
+
+        if game.is_paused or game.game_over:
+            return
+
+        now = game.ticks.get_ticks()
+
+        if self.reveal_until is not None:
+            if now < self.reveal_until:
+                return
+
+            game.handle_input("enter_up")
+            self.reveal_until = None
+            self.next_key = max(self.next_key, now)
+
+        # A long frame can hold more than one keystroke
+        while self.next_key <= now and not game.game_over:
+            target = self.pick_target(game)
+
+            if target is None:
+                self.next_key = now + self.interval
+                break
+
+            if target is not self.target:
+                self.target = target
+
+                if isinstance(target, Word) and self.random.random() < self.reveal_rate:
+                    game.handle_input("enter_down")
+                    self.reveal_until = now + self.reveal_time
+                    self.reveals += 1
+                    break
+
+            self.press(game, target.original_value[target.index_target])
+            self.next_key += self.interval
+
+    def pick_target(self, game):
+        """The powerup in the footer comes first, then whatever it was already typing, then the lowest word."""
+
+        if game.powerup_footer_text is not None:
+            return game.powerup_footer_text
+
+        if isinstance(self.target, Word) and self.target.slot is not None:
+            return self.target
+
+        if not game.words:
+            return None
+
+        return max(game.words, key=lambda word: word.y)
+
+    def press(self, game, letter):
+        if self.random.random() < self.error_rate:
+            letter = self.random.choice(self.LETTERS.replace(letter, ''))
+            self.errors += 1
+
+        start = time.perf_counter()
+        game.handle_input("letter", letter)
+        elapsed = time.perf_counter() - start
+
+        self.keystrokes += 1
+        self.keystroke_time += elapsed
+        self.slowest_keystroke = max(self.slowest_keystroke, elapsed)
+
+    def report(self):
+        return {
+            "wpm": self.wpm,
+            "keystrokes": self.keystrokes,
+            "errors": self.errors,
+            "reveals": self.reveals,
+            "average_keystroke": self.keystroke_time / max(1, self.keystrokes),
+            "slowest_keystroke": self.slowest_keystroke
+        }
+
+    def __repr__(self):
+        return f"Typist({self.wpm} wpm, {self.keystrokes:,} keystrokes, {self.errors:,} errors)"
+
+
+def simulate(difficulty='Normal', duration=60*60*1000, frame_time=SIMULATION_STEP*MAX_SIMULATION_STEPS, player=None, seed=None):
+    """
+    Plays a game as fast as possible, moving its clock on by frame_time milliseconds each frame. player is called
+    with the game before every frame so it can type through game.handle_input, without one the words just fall.
+    Stops at game over or once duration milliseconds have been simulated. Returns the game and how long each frame
+    took in seconds.
+    """
+
+    if not HEADLESS:
+        raise RuntimeError("Games can only be simulated in headless mode")
+
+    game = Game(f"Difficulty: {difficulty}", seed)
+    game.start()
+
+    frame_times = []
+
+    while not game.game_over and game.ticks.get_ticks() < duration:
+        was_paused = game.is_paused
+
+        if player is not None:
+            player(game)
+
+        start = time.perf_counter()
+        game.frame(frame_time, was_paused)
+        frame_times.append(time.perf_counter() - start)
+
+    return game, frame_times
+
+
+def replay(recording):
+    """
+    Plays a recording back as fast as possible, in the window or headless. Returns the game and how long each frame
+    took in seconds, so builds can be compared on the same game.
+    """
+
+    game = Game(recording.difficulty, recording.seed)
+    game.start()
+
+    frame_times = []
+    was_paused = game.is_paused
+
+    for kind, value in recording.records:
+        if kind == "frame":
+            start = time.perf_counter()
+            game.frame(value, was_paused)
+            frame_times.append(time.perf_counter() - start)
+            was_paused = game.is_paused
+        else:
+            game.handle_input(kind, value)
+
+    return game, frame_times
+
+
+def build_benchmark_game(size):
+    """A game with size words spread down the screen, so that all of them get hit, moved and drawn."""
+
+    game = Game("Difficulty: Normal", seed=size)
+    game.start()
+
+    while len(game.words) < size:
+        game.spawn_common_word()
+
+    n = game.store.count
+    game.store.y[:n] = np.linspace(0, HEIGHT - FOOTER_HEIGHT - WORD_SIZE, n)
+    game.store.previous_y[:n] = game.store.y[:n]
+    game.store.lowest = np.inf # the words were put in place by hand, so the lowest one needs finding again
+    return game
+
+
+def time_calls(action, setup=None, number=100, repeat=5):
+    """Best average seconds per call out of repeat runs, with setup run off the clock before every call."""
+
+    best = float('inf')
+
+    for _ in range(repeat):
+        total = 0
+
+        for _ in range(number):
+            if setup is not None:
+                setup()
+
+            start = time.perf_counter()
+            action()
+            total += time.perf_counter() - start
+
+        best = min(best, total / number)
+
+    return best
+
+
+def benchmark(sizes=BENCHMARK_SIZES):
+    """
+    Times the hot paths of a game with each number of words on the screen. Returns {case: {size: seconds per call}},
+    with the sizes as strings so the results go straight to and from JSON.
+    """
+
+    if not HEADLESS:
+        raise RuntimeError("Benchmarks can only be run in headless mode")
+
+    # Draw onto a real surface, otherwise rendering would cost nothing
+    global screen
+    screen = pg.Surface((WIDTH, HEIGHT))
+
+    results = {}
+
+    for size in sizes:
+        game = build_benchmark_game(size)
+        store = game.store
+        n = store.count
+        y = store.y[:n].copy()
+        number = max(3, 10000 // size)
+
+        def restore():
+            store.y[:n] = y
+            store.previous_y[:n] = y
+            store.lowest = np.inf
+            game.dirty.current.clear()
+
+        spawned = []
+
+        def spawn():
+            spawned.append(game.spawn_common_word())
+
+        def unspawn():
+            while spawned:
+                game.remove_word(spawned.pop())
+            restore()
+
+        # The letter the most words are waiting on, and a key that no word is waiting on
+        hit = max(game.targets, key=lambda letter: len(game.targets[letter]))
+        miss = '#'
+
+        def unhit():
+            game.hide_words()
+            restore()
+
+        def render():
+            game.draw_bg()
+            game.draw_words()
+            game.draw_footer()
+            game.dirty.update()
+
+        cases = {
+            "spawn_common_word": (spawn, unspawn),
+            "damage_words_hit": (lambda: game.damage_words(hit), unhit),
+            "damage_words_miss": (lambda: game.damage_words(miss), None),
+            "update_words": (lambda: game.update_words(SIMULATION_STEP), restore),
+            "reveal_words": (game.reveal_words, game.hide_words),
+            "hide_words": (game.hide_words, game.reveal_words),
+            "partially_reveal_words": (game.partially_reveal_words, game.hide_words),
+            "render": (render, None)
+        }
+
+        for case, (action, setup) in cases.items():
+            results.setdefault(case, {})[str(size)] = time_calls(action, setup, number)
+
+    return results
+
+
+def compare_benchmarks(results, baseline, threshold=BENCHMARK_THRESHOLD):
+    """Everything which got more than threshold slower than the baseline, as (case, size, before, after)."""
+
+    regressions = []
+
+    for case, sizes in results.items():
+        for size, after in sizes.items():
+            before = baseline.get(case, {}).get(size)
+
+            if before and after > before * (1 + threshold):
+                regressions.append((case, size, before, after))
+
+    return regressions
+
+
+def startup_report():
+    """
+    Times each part of starting the game in this process. The menu goes up while the asset loader is working in the
+    background, like it does when playing, and the loader's times are added once it has finished.
+    """
+
+    ASSETS.start()
+
+    with startup_phase("main_menu"):
+        # Up to the first frame of the menu being on the screen, without waiting for anyone to press anything
+        MainMenu().draw(0)
+        if not HEADLESS:
+            pg.display.update()
+        ASSETS.shown_menu()
+
+    ASSETS.thread.join()
+
+    # Starting the music and finding the pages set off more loading in the background, which has to be done before
+    # this process is finished with
+    MUSIC.wait()
+    PAGE_IMAGES.wait()
+
+    # The asset loader's times, grouped into the parts of starting up they replaced
+    groups = {"sfx_load": 0, "music_load": 0, "word_list": 0, "page_discovery": 0}
+    for name, asset in ASSETS.assets.items():
+        if asset.error is not None:
+            raise asset.error
+
+        group = {"music": "music_load", "words": "word_list", "pages": "page_discovery"}.get(name, "sfx_load")
+        groups[group] += asset.load_time
+
+    times = dict(STARTUP_TIMES)
+    times.update(groups)
+    times["total"] = time.perf_counter() - START_TIME
+    return times
+
+
+def repeat_startup_report(runs):
+    """Starts the game runs times in new processes, since most of starting up only happens once per process."""
+
+    samples = []
+    assets = []
+
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "startup.json")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--startup-report", path, "--repeat", "1"] + (["--headless"] if HEADLESS else []), check=True, capture_output=True)
+
+            with open(path) as file:
+                report = json.load(file)
+            samples.append(report["samples"][0])
+            assets.append(report["assets"][0])
+
+    return samples, assets
+
+
+def summarise_startup(samples, assets):
+    phases = {}
+
+    for phase in samples[0]:
+        values = [sample[phase] for sample in samples]
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        phases[phase] = {"p50": p50, "p95": p95, "p99": p99, "min": min(values), "max": max(values)}
+
+    menu_target_met = sum(1 for report in assets if report["menu_target_met"])
+    return {"runs": len(samples), "phases": phases, "menu_target_met": menu_target_met, "samples": samples, "assets": assets}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Word Crusher")
+    parser.add_argument('--headless', action='store_true', help="simulate a game without a window or sound")
+    parser.add_argument('--dsp-music', action='store_true', help="filter the music as it plays instead of playing three versions")
+    parser.add_argument('--difficulty', default='Normal', choices=["Easy", "Normal", "Hard", "Gamer"])
+    parser.add_argument('--duration', type=float, default=60, help="most minutes of play to simulate when headless")
+    parser.add_argument('--record', metavar='PATH', help="save the last game played to a recording")
+    parser.add_argument('--replay', metavar='PATH', help="play a recording back as fast as possible and time it")
+    parser.add_argument('--profile', metavar='PATH', help="time each part of every frame and save them to a CSV, and the idle screens' CPU use next to it")
+    parser.add_argument('--benchmark', metavar='PATH', help="time the hot paths with more and more words and save them as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="benchmark results to flag regressions against")
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD, help="fraction slower than the baseline to flag")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES, help="numbers of words to benchmark with")
+    parser.add_argument('--startup-report', metavar='PATH', help="time each part of starting up, save it as JSON and quit")
+    parser.add_argument('--repeat', type=int, default=5, help="how many times to start up for the startup report")
+    parser.add_argument('--bot', type=float, metavar='WPM', help="let a bot typing at WPM words per minute play")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="how often the bot hits the wrong letter")
+    parser.add_argument('--reveal-rate', type=float, default=0.1, help="how often the bot holds enter to peek at a word")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
 
-    # Load instruction pages
-    pages = []
-    for idx, file in enumerate(os.listdir(PAGES_PATH)):
-        path = os.path.join(PAGES_PATH, file)
-        page = Page.load_from_img(path)
-        pages.append(page)
+    if args.startup_report:
+        if args.repeat == 1:
+            samples = [startup_report()]
+            assets = [ASSETS.report()]
+        else:
+            samples, assets = repeat_startup_report(args.repeat)
+        report = summarise_startup(samples, assets)
+
+        with open(args.startup_report, 'w') as file:
+            json.dump(report, file, indent=4)
+
+        if args.repeat > 1:
+            print(f"{'ms':<16}{'p50':>9}{'p95':>9}{'p99':>9}")
+            for phase, values in report["phases"].items():
+                print(f"{phase:<16}" + "".join(f"{1000 * values[key]:>9.1f}" for key in ["p50", "p95", "p99"]))
+            print(f"Menu up within {MENU_TARGET}ms in {report['menu_target_met']}/{report['runs']} runs")
+        sys.exit()
+
+    if args.replay:
+        recording = Recording.load(args.replay)
+        game, frame_times = replay(recording)
+        frame_times.sort()
+
+        result = "matches" if game.score == recording.score else f"doesn't match the recorded {recording.score:,}"
+        print(f"Replayed {len(frame_times):,} frames of {recording.difficulty} in {sum(frame_times):.2f}s")
+        print(f"Frame time: mean {1000 * sum(frame_times) / max(1, len(frame_times)):.2f}ms, max {1000 * frame_times[-1]:.2f}ms" if frame_times else "No frames")
+        print(f"Score: {game.score:,}, which {result}")
+        sys.exit()
+
+    if args.benchmark:
+        results = benchmark(args.sizes)
+
+        with open(args.benchmark, 'w') as file:
+            json.dump(results, file, indent=4)
+
+        for case, sizes in results.items():
+            print(f"{case:<24}" + "".join(f"{size:>8}: {1e6 * seconds:>10,.1f}us" for size, seconds in sizes.items()))
+
+        if args.baseline:
+            with open(args.baseline) as file:
+                regressions = compare_benchmarks(results, json.load(file), args.threshold)
+
+            for case, size, before, after in regressions:
+                print(f"REGRESSION {case} with {size} words: {1e6 * before:,.1f}us -> {1e6 * after:,.1f}us ({after / before - 1:+.0%})")
+            print(f"{len(regressions)} regressions over {args.threshold:.0%}")
+            sys.exit(1 if regressions else 0)
+        sys.exit()
+
+    bot = None
+    if args.bot:
+        bot = Typist(args.bot, args.error_rate, args.reveal_rate)
+
+    if HEADLESS:
+        start = time.perf_counter()
+        game, frame_times = simulate(args.difficulty, args.duration * 60 * 1000, player=bot)
+        elapsed = time.perf_counter() - start
+        simulated = game.ticks.get_ticks() / 1000
+        frame_times.sort()
+
+        print(f"Simulated {simulated:,.1f}s of {game.difficulty} in {elapsed:.2f}s ({simulated / elapsed:,.0f}x real time)")
+        print(f"Score: {game.score:,}, level {game.background_based_level}, game over: {game.game_over}")
+        print(f"Frame time: mean {1000 * sum(frame_times) / max(1, len(frame_times)):.3f}ms, max {1000 * frame_times[-1]:.3f}ms" if frame_times else "No frames")
+        print(f"Spawned {game.spawned:,} words, {60 * game.spawned / max(1, simulated):.1f} a minute")
+
+        if bot is not None:
+            report = bot.report()
+            print(f"{bot}, {report['reveals']:,} reveals")
+            print(f"Keystroke time: mean {1e6 * report['average_keystroke']:.1f}us, max {1e6 * report['slowest_keystroke']:.1f}us")
+        sys.exit()
+
+    # Everything else loads behind the menu
+    ASSETS.start()
+
+    # How much CPU the screens that wait for input used goes next to the frame times
+    idle_path = os.path.splitext(args.profile)[0] + "_idle.csv" if args.profile else None
     
     while True:
         first_run = True
@@ -1713,17 +3912,28 @@ if __name__ == "__main__":
                 
                 difficulty = menu.buttons['Difficulty'].value
                 
-                game = Game(difficulty)
+                game = Game(difficulty, record=args.record is not None, profile=args.profile is not None)
+                game.player = bot
                 game.run()
 
+                if args.record:
+                    game.recording.save(args.record)
+
+                if args.profile:
+                    game.profiler.save(args.profile)
+                    save_idle_cpu(idle_path)
+
             if not game.to_menu:
                 break
 
         elif menu.button_pressed == menu.buttons['Instructions']:
             
-            instructions = Instructions(pages)
+            instructions = Instructions(ASSETS.get("pages"))
             instructions.run()
 
+            if args.profile:
+                save_idle_cpu(idle_path)
+
             if instructions.quitting:
                 break
 
@@ -1731,6 +3941,9 @@ if __name__ == "__main__":
             stats = Stats()
             stats.run()
 
+            if args.profile:
+                save_idle_cpu(idle_path)
+
             if stats.quitting:
                 break
 